@@ -98,6 +98,7 @@ class ModelCardToolkit():
       output_dir: Optional[str] = None,
       mlmd_source: Optional[MlmdSource] = None,
       source: Optional[Source] = None,
+      plot_max_workers: Optional[int] = None,
   ):
     """Initializes the ModelCardToolkit.
 
@@ -115,6 +116,10 @@ class ModelCardToolkit():
         be used instead of `mlmd_source`, or alongside it. Useful when using
         tools like TensorFlow Model Analysis and Data Validation without writing
         to a MLMD store.
+      plot_max_workers: If greater than 1, the plots of the dataset statistics
+        and evaluation results are drawn in parallel by up to this many worker
+        processes. By default, they are drawn one after another in this
+        process.
 
     Raises:
       ValueError: If a model cannot be found at mlmd_source.model_uri.
@@ -133,6 +138,7 @@ class ModelCardToolkit():
     )
     self._model_cards_dir = os.path.join(self.output_dir, _MODEL_CARDS_DIR)
     self._source = source
+    self._plot_max_workers = plot_max_workers
 
     # set in _process_mlmd_source()
     self._store = None
@@ -200,18 +206,23 @@ class ModelCardToolkit():
                 self._source.tfma.metrics_exclude
             )
           tf_utils.annotate_eval_result_metrics(model_card, eval_result)
-          tf_graphics.annotate_eval_result_plots(model_card, eval_result)
+          tf_graphics.annotate_eval_result_plots(
+              model_card, eval_result, self._plot_max_workers
+          )
         else:
           logging.info('EvalResult not found at path %s', eval_result_path)
     if self._store:
       metrics_artifacts = tf_utils.get_metrics_artifacts_for_model(
-          self._store, self._artifact_with_model_uri.id
+          self._store, self._artifact_with_model_uri.id,
+          model=self._artifact_with_model_uri
       )
       for metrics_artifact in metrics_artifacts:
         eval_result = tf_utils.read_metrics_eval_result(metrics_artifact.uri)
         if eval_result is not None:
           tf_utils.annotate_eval_result_metrics(model_card, eval_result)
-          tf_graphics.annotate_eval_result_plots(model_card, eval_result)
+          tf_graphics.annotate_eval_result_plots(
+              model_card, eval_result, self._plot_max_workers
+          )
     return model_card
 
   def _annotate_dataset_statistics(self, model_card: ModelCard) -> ModelCard:
@@ -244,16 +255,17 @@ class ModelCardToolkit():
         else:
           data_stats = tf_utils.read_stats_protos(dataset_stats_path)
         tf_graphics.annotate_dataset_feature_statistics_plots(
-            model_card, data_stats
+            model_card, data_stats, self._plot_max_workers
         )
     if self._store:
       stats_artifacts = tf_utils.get_stats_artifacts_for_model(
-          self._store, self._artifact_with_model_uri.id
+          self._store, self._artifact_with_model_uri.id,
+          model=self._artifact_with_model_uri
       )
       for stats_artifact in stats_artifacts:
         data_stats = tf_utils.read_stats_protos(stats_artifact.uri)
         tf_graphics.annotate_dataset_feature_statistics_plots(
-            model_card, data_stats
+            model_card, data_stats, self._plot_max_workers
         )
     return model_card
 
@@ -288,7 +300,8 @@ class ModelCardToolkit():
     # Pre-populate ModelCard fields
     if self._store:
       model_card = tf_utils.generate_model_card_for_model(
-          self._store, self._artifact_with_model_uri.id
+          self._store, self._artifact_with_model_uri.id,
+          model=self._artifact_with_model_uri
       )
     else:
       model_card = ModelCard()
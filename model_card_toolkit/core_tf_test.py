@@ -113,6 +113,25 @@ class TfCoreTest(parameterized.TestCase, TfxTest):
     self.assertEqual(mock_annotate_data_stats.call_count, num_stat_artifacts)
     self.assertEqual(mock_annotate_eval_results.call_count, num_eval_artifacts)
 
+  @mock.patch.object(
+      tf_graphics, 'annotate_dataset_feature_statistics_plots', autospec=True
+  )
+  @mock.patch.object(tf_graphics, 'annotate_eval_result_plots', autospec=True)
+  def test_scaffold_assets_with_plot_max_workers(
+      self, mock_annotate_eval_results, mock_annotate_data_stats
+  ):
+    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
+    toolkit = core.ModelCardToolkit(
+        output_dir=self.mct_dir, mlmd_source=tf_sources.MlmdSource(
+            store=store, model_uri=tf_testdata_utils.TFX_0_21_MODEL_URI
+        ), plot_max_workers=4
+    )
+    toolkit.scaffold_assets()
+    for annotate in (mock_annotate_eval_results, mock_annotate_data_stats):
+      self.assertNotEmpty(annotate.call_args_list)
+      for call in annotate.call_args_list:
+        self.assertEqual(call.args[2], 4)
+
   @parameterized.parameters(
       ('', True), ('', False), ('tfrecord', True), ('tfrecord', False)
   )
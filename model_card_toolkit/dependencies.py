@@ -29,6 +29,7 @@ _VERSIONS = {
     'protobuf': 'protobuf>=3.19.0,<4',
     'pylint': 'pylint',
     'pytest': 'pytest',
+    'pytest-xdist': 'pytest-xdist',
     'tensorflow_data_validation': 'tensorflow-data-validation>=1.5.0,<2.0.0',
     'tensorflow_datasets': 'tensorflow-datasets>=4.8.2',
     'tensorflow_metadata': 'tensorflow-metadata>=1.5.0,<2.0.0',
@@ -56,7 +57,9 @@ _TENSORFLOW_EXTRA_DEPS = [
     'tensorflow_model_analysis',
 ]
 
-_TEST_EXTRA_DEPS = ['absl', 'isort', 'pre-commit', 'pylint', 'pytest', 'yapf']
+_TEST_EXTRA_DEPS = [
+    'absl', 'isort', 'pre-commit', 'pylint', 'pytest', 'pytest-xdist', 'yapf'
+]
 
 TENSORFLOW_EXTRA_IMPORT_ERROR_MSG = """
 This functionaliy requires `tensorflow` extra dependencies but they were not
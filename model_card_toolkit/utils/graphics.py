@@ -14,13 +14,18 @@
 """Utilities for generating model card plots/graphics."""
 
 import base64
+import concurrent.futures
 import io
 import logging
-from typing import Optional, Sequence, Tuple, Union
+import multiprocessing
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Tuple, Union
 
 import attr
-import matplotlib
-import matplotlib.pyplot as plt
+
+if TYPE_CHECKING:
+  # matplotlib is imported when a figure is first drawn, as it is slow to import
+  # and is not needed to stringify slice keys.
+  import matplotlib.figure
 
 _COLOR_PALETTE = {
     'material_cyan_700': '#129EAF',  # default
@@ -29,8 +34,12 @@ _COLOR_PALETTE = {
     'material_purple_500': '#A142F4'  # quantitative analysis
 }
 
+# Graphs with more bars than this are drawn without a value label on each bar,
+# which would be illegible and dominate the cost of drawing them.
+_MAX_LABELED_BARS = 100
+
 
-@attr.s(auto_attribs=True)
+@attr.s(auto_attribs=True, slots=True)
 class Graph():
   """Model Card graph."""
 
@@ -45,15 +54,48 @@ class Graph():
   color: str = _COLOR_PALETTE['material_cyan_700']
 
   # Graph generated from the data above.
-  figure: Optional[matplotlib.figure.Figure] = None
+  figure: Optional['matplotlib.figure.Figure'] = None
   base64str: Optional[str] = None
 
 
-def draw_histogram(graph: Graph) -> Optional[Graph]:
+def _matplotlib_agg() -> Tuple[Any, Any]:
+  """Returns the matplotlib.figure and Agg backend modules.
+
+  They are only imported once a figure is drawn or encoded, as matplotlib is
+  slow to import.
+  """
+  import matplotlib.figure  # pylint: disable=import-outside-toplevel
+  from matplotlib.backends import backend_agg  # pylint: disable=import-outside-toplevel
+  return matplotlib.figure, backend_agg
+
+
+def _new_figure() -> 'matplotlib.figure.Figure':
+  """Creates a single-axes figure to draw a histogram into.
+
+  The figure is rendered by the Agg backend and, unlike figures created with
+  pyplot, is not registered with pyplot's global figure manager, so it does not
+  need to be closed and is freed once unreferenced.
+
+  Returns:
+    A matplotlib Figure with one axes.
+  """
+  figure_module, backend_agg = _matplotlib_agg()
+  figure = figure_module.Figure()
+  backend_agg.FigureCanvasAgg(figure)
+  figure.subplots()
+  return figure
+
+
+def draw_histogram(
+    graph: Graph, figure: Optional['matplotlib.figure.Figure'] = None
+) -> Optional[Graph]:
   """Draw a histogram given the graph.
 
   Args:
     graph: The Graph object represents the necessary data to draw a histogram.
+    figure: An optional single-axes figure to draw into. Its axes are cleared
+      before drawing, so one figure can be reused for many graphs instead of
+      creating a new one each time. If not provided, a new figure is created.
 
   Returns:
     A Graph object, or None if plotting raises TypeError given the raw data.
@@ -61,8 +103,11 @@ def draw_histogram(graph: Graph) -> Optional[Graph]:
   if not graph:
     return None
   try:
-    # generate and open a new figure
-    figure, ax = plt.subplots()
+    if figure is None:
+      figure = _new_figure()
+    else:
+      figure.axes[0].clear()
+    ax = figure.axes[0]
     # When graph.x or y is str, the histogram is ill-defined.
     ax.barh(graph.y, graph.x, color=graph.color)
     ax.set_title(graph.title)
@@ -70,39 +115,134 @@ def draw_histogram(graph: Graph) -> Optional[Graph]:
       ax.set_xlabel(graph.xlabel)
     if graph.ylabel:
       ax.set_ylabel(graph.ylabel)
-    for index, value in enumerate(graph.x):
-      show_value = f'{value:.2f}' if isinstance(value, float) else value
-      # To avoid the number has overlap with the box of the graph.
-      if value > 0.9 * max(graph.x):
-        ax.text(
-            value - (value / 10), index, show_value, va='center', color='w'
-        )
-      else:
-        ax.text(value, index, show_value, va='center')
+    if len(graph.x) <= _MAX_LABELED_BARS:
+      # Labels of bars reaching this close to the right edge of the axes are
+      # drawn inside the bar, to avoid overlapping with the box of the graph.
+      threshold = 0.9 * ax.get_xlim()[1]
+      for index, value in enumerate(graph.x):
+        show_value = f'{value:.2f}' if isinstance(value, float) else value
+        if value > threshold:
+          ax.text(
+              value - (value / 10), index, show_value, va='center', color='w'
+          )
+        else:
+          ax.text(value, index, show_value, va='center')
+    # Fit the layout once here, rather than letting savefig measure it with an
+    # extra rendering pass.
+    figure.tight_layout()
 
     graph.figure = figure
-    graph.base64str = figure_to_base64str(figure)
+    graph.base64str = _laid_out_figure_to_base64str(figure)
   except TypeError as e:
     logging.info('skipping %s for histogram; plot error: %s:', graph.name, e)
     return None
-  finally:
-    # closes the figure (to limit memory consumption)
-    plt.close()
   return graph
 
 
-def figure_to_base64str(fig: matplotlib.figure.Figure) -> str:
+def draw_histograms(
+    graphs: Sequence[Graph], max_workers: Optional[int] = None
+) -> List[Optional[Graph]]:
+  """Draws a histogram for each of the given graphs.
+
+  Args:
+    graphs: The Graph objects to draw, as for `draw_histogram`.
+    max_workers: If greater than 1, the histograms are drawn in parallel by up
+      to this many worker processes. Otherwise, they are drawn one after another
+      in this process, reusing a single figure.
+
+  Returns:
+    For each of graphs, the Graph object, or None if plotting raises TypeError
+    given its raw data. Only the `base64str` of the graphs is set; their
+    `figure` is None, as one figure is redrawn for every graph, or the figures
+    are not sent back from the worker processes.
+  """
+  if not graphs:
+    return []
+  if not max_workers or max_workers <= 1:
+    figure = _new_figure()
+    drawn = []
+    for graph in graphs:
+      graph = draw_histogram(graph, figure)
+      if graph is not None:
+        graph.figure = None
+      drawn.append(graph)
+    return drawn
+
+  # Worker processes are spawned rather than forked, as the calling process may
+  # hold state that is not fork-safe, e.g. TensorFlow's thread pools.
+  with concurrent.futures.ProcessPoolExecutor(
+      max_workers, mp_context=multiprocessing.get_context('spawn')
+  ) as executor:
+    base64strs = list(executor.map(_draw_histogram_base64str, graphs))
+  drawn = []
+  for graph, base64str in zip(graphs, base64strs):
+    if base64str is None:
+      drawn.append(None)
+    else:
+      graph.base64str = base64str
+      drawn.append(graph)
+  return drawn
+
+
+def _draw_histogram_base64str(graph: Graph) -> Optional[str]:
+  """Draws a histogram and returns its base64 encoding, or None on error."""
+  graph = draw_histogram(graph)
+  return graph.base64str if graph else None
+
+
+def figure_to_base64str(
+    fig: 'matplotlib.figure.Figure', compress_level: int = 1,
+    bbox_inches: Optional[str] = 'tight'
+) -> str:
   """Converts a Matplotlib figure to a base64 string encoding.
 
   Args:
     fig: A matplotlib Figure.
+    compress_level: The zlib compression level of the PNG, from 0 (none) to 9
+      (smallest output). Defaults to 1, which is much faster to encode than
+      higher levels at the cost of a slightly larger image.
+    bbox_inches: The `bbox_inches` argument of `Figure.savefig`. 'tight' fits
+      the image to the figure's artists but renders the figure twice; pass None
+      for figures whose layout was already fixed, e.g. with `tight_layout()`.
 
   Returns:
     A base64 encoding of the figure.
   """
   buf = io.BytesIO()
-  fig.savefig(buf, bbox_inches='tight', format='png')
-  return base64.b64encode(buf.getbuffer().tobytes()).decode('ascii')
+  fig.savefig(
+      buf, bbox_inches=bbox_inches, format='png',
+      pil_kwargs={'compress_level': compress_level}
+  )
+  return _png_buffer_to_base64str(buf)
+
+
+def _laid_out_figure_to_base64str(fig: 'matplotlib.figure.Figure') -> str:
+  """Converts a figure with a fixed layout to a base64 string encoding.
+
+  Figures with an Agg canvas, such as those of `draw_histogram`, are printed
+  straight to PNG by their canvas, which skips the backend lookup and
+  temporary figure state of `Figure.savefig`. rcParams['savefig.*'] are not
+  applied to them.
+
+  Args:
+    fig: A matplotlib Figure, whose layout was already fixed.
+
+  Returns:
+    A base64 encoding of the figure.
+  """
+  _, backend_agg = _matplotlib_agg()
+  if not isinstance(fig.canvas, backend_agg.FigureCanvasAgg):
+    return figure_to_base64str(fig, bbox_inches=None)
+  buf = io.BytesIO()
+  fig.canvas.print_png(buf, pil_kwargs={'compress_level': 1})
+  return _png_buffer_to_base64str(buf)
+
+
+def _png_buffer_to_base64str(buf: io.BytesIO) -> str:
+  """Returns the base64 encoding of the contents of buf."""
+  # Encode straight from a view of the buffer rather than a copy of it.
+  with buf.getbuffer() as png:
+    return base64.b64encode(png).decode('ascii')
 
 
 # FeatureValueType represents a value that a feature could take.
@@ -13,6 +13,10 @@
 # limitations under the License.
 """Tests for model_card_toolkit.utils.graphics."""
 
+import base64
+from unittest import mock
+
+import matplotlib.pyplot as plt
 from absl.testing import absltest, parameterized
 
 from model_card_toolkit.utils import graphics
@@ -48,6 +52,69 @@ class GraphicsTest(parameterized.TestCase):
     result = graphics.stringify_slice_key(slices)
     self.assertEqual(result, expected_result)
 
+  def test_figure_to_base64str(self):
+    fig, ax = plt.subplots()
+    ax.barh(['a', 'b'], [1, 2])
+    first = graphics.figure_to_base64str(fig)
+    second = graphics.figure_to_base64str(fig)
+    plt.close(fig)
+    self.assertEqual(first, second)
+    self.assertTrue(base64.b64decode(first).startswith(b'\x89PNG'))
+
+  def test_draw_histogram_reuses_figure(self):
+    graph_data = dict(x=[1, 2.5, 10], y=['a', 'b', 'c'], title='title')
+    expected = graphics.draw_histogram(graphics.Graph(**graph_data))
+    figure = graphics._new_figure()
+    graphics.draw_histogram(graphics.Graph(x=[5, 2], y=['x', 'y']), figure)
+    graph = graphics.draw_histogram(graphics.Graph(**graph_data), figure)
+    self.assertIs(graph.figure, figure)
+    self.assertEqual(graph.base64str, expected.base64str)
+
+  def test_draw_histogram_matches_savefig(self):
+    graph = graphics.draw_histogram(graphics.Graph(x=[1, 2.5], y=['a', 'b']))
+    self.assertEqual(
+        graph.base64str,
+        graphics.figure_to_base64str(graph.figure, bbox_inches=None)
+    )
+
+  def test_draw_histogram_skips_labels_of_many_bars(self):
+    num_bars = graphics._MAX_LABELED_BARS + 1
+    graph = graphics.draw_histogram(
+        graphics.Graph(x=list(range(num_bars)), y=list(range(num_bars)))
+    )
+    self.assertEmpty(graph.figure.axes[0].texts)
+    graph = graphics.draw_histogram(graphics.Graph(x=[1, 2.5], y=['a', 'b']))
+    self.assertEqual(
+        [text.get_text() for text in graph.figure.axes[0].texts],
+        ['1', '2.50']
+    )
+
+  def test_draw_histograms(self):
+    graphs = [
+        graphics.Graph(x=[1, 2.5, 10], y=['a', 'b', 'c']),
+        graphics.Graph(x=['a'], y=['b']),
+        graphics.Graph(x=[5, 2], y=['x', 'y']),
+    ]
+    expected = graphics.draw_histogram(
+        graphics.Graph(x=[1, 2.5, 10], y=['a', 'b', 'c'])
+    )
+    drawn = graphics.draw_histograms(graphs)
+    self.assertIs(drawn[0], graphs[0])
+    self.assertEqual(drawn[0].base64str, expected.base64str)
+    self.assertIsNone(drawn[0].figure)
+    self.assertIsNone(drawn[1])
+    self.assertIsNone(drawn[2].figure)
+    with mock.patch.object(graphics, '_new_figure') as new_figure:
+      self.assertEmpty(graphics.draw_histograms([]))
+      new_figure.assert_not_called()
+
+  def test_draw_histograms_in_worker_processes(self):
+    graph = graphics.Graph(x=[1], y=['a'])
+    expected = graphics.draw_histogram(graphics.Graph(x=[1], y=['a']))
+    [drawn] = graphics.draw_histograms([graph], max_workers=2)
+    self.assertIs(drawn, graph)
+    self.assertEqual(drawn.base64str, expected.base64str)
+
 
 if __name__ == '__main__':
   absltest.main()
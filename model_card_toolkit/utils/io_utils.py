@@ -16,7 +16,7 @@
 
 import os
 from pathlib import Path
-from typing import Union
+from typing import Iterable, Union
 
 from google.protobuf.message import Message
 
@@ -27,21 +27,35 @@ def suffix(path: Union[str, Path]) -> str:
 
 
 def write_file(
-    path: Union[str, Path], content: Union[str, bytes], mode: str = 'w'
+    path: Union[str, Path],
+    content: Union[str, bytes, Iterable[Union[str, bytes]]], mode: str = 'w'
 ):
   """Writes content to a file, creating any necessary directories.
 
   Args:
     path: The file path to write to
-    content: The content to write.
+    content: The content to write, or an iterable of chunks of it, which are
+      written as they are produced.
     mode: The mode to open the file in. Defaults to 'w'.
 
   Raises:
     ValueError: If an invalid mode is provided.
   """
-  os.makedirs(os.path.dirname(path), exist_ok=True)
-  with open(path, mode) as f:
-    f.write(content)
+  # Only create the directories if opening the file fails, rather than checking
+  # every component of an existing directory on each write.
+  try:
+    f = open(path, mode)
+  except FileNotFoundError:
+    dirname = os.path.dirname(path)
+    if not dirname:
+      raise
+    os.makedirs(dirname, exist_ok=True)
+    f = open(path, mode)
+  with f:
+    if isinstance(content, (str, bytes)):
+      f.write(content)
+    else:
+      f.writelines(content)
 
 
 def write_proto_file(path: Union[str, Path], proto: Message):
@@ -65,10 +79,11 @@ def read_file(path: Union[str, Path], mode: str = 'r') -> Union[str, bytes]:
     FileNotFoundError: If the file does not exist.
     ValueError: If an invalid mode is provided.
   """
-  if not os.path.exists(path):
-    raise FileNotFoundError(f'File {path} does not exist.')
-
-  with open(path, mode) as f:
+  try:
+    f = open(path, mode)
+  except FileNotFoundError as e:
+    raise FileNotFoundError(f'File {path} does not exist.') from e
+  with f:
     return f.read()
 
 
@@ -82,9 +97,5 @@ def parse_proto_file(path: Union[str, Path], proto: Message) -> Message:
   Raises:
     FileNotFoundError: If the file does not exist.
   """
-  if not os.path.exists(path):
-    raise FileNotFoundError(f'File {path} does not exist.')
-
-  with open(path, 'rb') as f:
-    proto.ParseFromString(f.read())
+  proto.ParseFromString(read_file(path, mode='rb'))
   return proto
@@ -38,6 +38,26 @@ class IoUtilsTest(absltest.TestCase):
       read_content = io_utils.read_file(path)
       self.assertEqual(content, read_content)
 
+  def test_write_file_creates_directories(self):
+    with tempfile.TemporaryDirectory() as test_dir:
+      path = os.path.join(test_dir, 'a', 'b', 'test.txt')
+      io_utils.write_file(path, 'content')
+      self.assertEqual('content', io_utils.read_file(path))
+
+  def test_write_file_chunks(self):
+    with tempfile.TemporaryDirectory() as test_dir:
+      path = os.path.join(test_dir, 'test.txt')
+      io_utils.write_file(path, iter(['This ', 'is ', 'chunked.']))
+      self.assertEqual('This is chunked.', io_utils.read_file(path))
+
+  def test_read_missing_file(self):
+    with tempfile.TemporaryDirectory() as test_dir:
+      path = os.path.join(test_dir, 'missing.txt')
+      with self.assertRaisesRegex(FileNotFoundError, 'does not exist'):
+        io_utils.read_file(path)
+      with self.assertRaisesRegex(FileNotFoundError, 'does not exist'):
+        io_utils.parse_proto_file(path, model_card_pb2.KeyVal())
+
   def test_write_and_parse_proto(self):
     with tempfile.TemporaryDirectory() as test_dir:
       path = os.path.join(test_dir, 'test.proto')
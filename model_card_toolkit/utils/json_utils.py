@@ -13,14 +13,13 @@
 # limitations under the License.
 """Util functions for Model Card JSON schema."""
 
+import functools
 import json
 import logging
 import os
 import pkgutil
 from typing import Any, Dict, Optional, Text
 
-import jsonschema
-
 _SCHEMA_FILE_NAME = 'model_card.schema.json'
 _SCHEMA_VERSIONS = frozenset((
     '0.0.1',
@@ -61,6 +60,16 @@ def _find_json_schema(schema_version: Optional[str] = None) -> Dict[str, Any]:
   return schema
 
 
+def _jsonschema() -> Any:
+  """Returns the jsonschema module.
+
+  jsonschema is slow to import, so it is only imported once a model card is
+  validated rather than when this module is imported.
+  """
+  import jsonschema  # pylint: disable=import-outside-toplevel
+  return jsonschema
+
+
 def validate_json_schema(
     json_dict: Dict[str, Any], schema_version: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -76,19 +85,62 @@ def validate_json_schema(
       omitted, defers to the latest schema version.
 
   Returns:
-    The schema used for validation.
+    The schema used for validation. It is shared between calls, and must not be
+    modified.
 
   Raises:
     ValueError: If `schema_version` does not correspond to a model card schema
       version.
     ValidationError: If `model_card_json` does not follow the model card schema.
   """
-  schema = _find_json_schema(
-      schema_version or json_dict.get('schema_version')
-      or _LATEST_SCHEMA_VERSION
-  )
-  jsonschema.validate(json_dict, schema)
-  return schema
+  validator = get_validator(schema_version or json_dict.get('schema_version'))
+  # Raise the same error that jsonschema.validate would.
+  error = _jsonschema().exceptions.best_match(validator.iter_errors(json_dict))
+  if error is not None:
+    raise error
+  return validator.schema
+
+
+def get_validator(schema_version: Optional[str] = None) -> Any:
+  """Returns a jsonschema validator for a model card schema version.
+
+  Validators are cached and shared, so that each schema is only loaded and
+  checked once. When validating many model cards against the same schema,
+  calling the validator's `validate` or `is_valid` methods directly also skips
+  the schema version lookup of `validate_json_schema`.
+
+  Args:
+    schema_version: The version of the model card schema. Optional field; if
+      omitted, defers to the latest schema version.
+
+  Returns:
+    A jsonschema validator for the schema.
+
+  Raises:
+    ValueError: If `schema_version` does not correspond to a model card schema
+      version.
+  """
+  return _get_validator(schema_version or _LATEST_SCHEMA_VERSION)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_validator(schema_version: str) -> Any:
+  """Returns a validator for a model card schema version; see get_validator.
+
+  Args:
+    schema_version: The version of the model card schema.
+
+  Returns:
+    A jsonschema validator for the schema.
+
+  Raises:
+    ValueError: If `schema_version` does not correspond to a model card schema
+      version.
+  """
+  schema = _find_json_schema(schema_version)
+  validator_cls = _jsonschema().validators.validator_for(schema)
+  validator_cls.check_schema(schema)
+  return validator_cls(schema)
 
 
 def get_latest_schema_version() -> str:
@@ -116,13 +168,28 @@ def update(json_dict: Optional[Dict[Text, Any]] = None) -> Dict[Text, Any]:
 
   Raises:
     ValidationError: If `json_dict` does not follow the model card JSON v0.0.1
-      schema.
+      schema, or declares v0.0.2 and does not follow that schema.
   """
+  # Dispatch on the declared schema version, and only probe the schemas of
+  # model cards that do not declare one. Anything else, e.g. None, is left for
+  # schema validation to reject.
+  schema_version = (
+      json_dict.get(SCHEMA_VERSION_STRING)
+      if isinstance(json_dict, dict) else None
+  )
+  if schema_version == _LATEST_SCHEMA_VERSION:
+    validate_json_schema(json_dict, _LATEST_SCHEMA_VERSION)
+    logging.info('JSON object already matches schema 0.0.2.')
+    return json_dict  # pytype: disable=bad-return-type
+  if schema_version == '0.0.1':
+    logging.info('JSON object declares schema 0.0.1; updating.')
+    return _update_from_v1_to_v2(json_dict)
+
   try:
     validate_json_schema(json_dict, '0.0.2')
     logging.info('JSON object already matches schema 0.0.2.')
     return json_dict  # pytype: disable=bad-return-type
-  except jsonschema.ValidationError:
+  except _jsonschema().ValidationError:
     logging.info('JSON object does match schema 0.0.2; updating.')
     return _update_from_v1_to_v2(json_dict)
 
@@ -149,68 +216,44 @@ def _update_from_v1_to_v2(json_dict: Dict[Text, Any]) -> Dict[Text, Any]:
   json_dict['schema_version'] = get_latest_schema_version()
 
   # Update model_details
-  if json_dict['model_details']['license']:
-    json_dict['model_details']['licenses'] = [
-        {
-            'custom_text': json_dict['model_details'].pop('license')
-        }
-    ]
-  if json_dict['model_details']['references']:
-    json_dict['model_details']['references'] = [
+  model_details = json_dict['model_details']
+  license_text = model_details.pop('license', None)
+  if license_text:
+    model_details['licenses'] = [{'custom_text': license_text}]
+  references = model_details.get('references')
+  if references:
+    model_details['references'] = [
         {
             'reference': reference
-        } for reference in json_dict['model_details']['references']
-    ]
-  if json_dict['model_details']['citation']:
-    json_dict['model_details']['citations'] = [
-        {
-            'citation': json_dict['model_details'].pop('citation')
-        }
+        } for reference in references
     ]
+  citation = model_details.pop('citation', None)
+  if citation:
+    model_details['citations'] = [{'citation': citation}]
 
   # Update model_parameters
-  if 'model_parameters' in json_dict and 'data' in json_dict['model_parameters'
-                                                             ]:
+  model_parameters = json_dict.get('model_parameters')
+  if model_parameters is not None and 'data' in model_parameters:
+    old_data = model_parameters['data']
     new_data = []
-    if 'train' in json_dict['model_parameters']['data']:
-      old_train_data = json_dict['model_parameters']['data']['train']
-      if 'name' not in old_train_data:
-        old_train_data['name'] = 'Training Set'
-      new_data.append(old_train_data)
-    if 'eval' in json_dict['model_parameters']['data']:
-      old_eval_data = json_dict['model_parameters']['data']['eval']
-      if 'name' not in old_eval_data:
-        old_eval_data['name'] = 'Validation Set'
-      new_data.append(old_eval_data)
-    json_dict['model_parameters']['data'] = new_data
+    for split, default_name in (
+        ('train', 'Training Set'), ('eval', 'Validation Set')
+    ):
+      if split in old_data:
+        old_split_data = old_data[split]
+        old_split_data.setdefault('name', default_name)
+        new_data.append(old_split_data)
+    model_parameters['data'] = new_data
 
   # Update considerations
-  if 'considerations' in json_dict and 'use_cases' in json_dict[
-      'considerations']:
-    json_dict['considerations']['use_cases'] = [
-        {
-            'description': use_case
-        } for use_case in json_dict['considerations']['use_cases']
-    ]
-  if 'considerations' in json_dict and 'users' in json_dict['considerations']:
-    json_dict['considerations']['users'] = [
-        {
-            'description': user
-        } for user in json_dict['considerations']['users']
-    ]
-  if 'considerations' in json_dict and 'limitations' in json_dict[
-      'considerations']:
-    json_dict['considerations']['limitations'] = [
-        {
-            'description': limitation
-        } for limitation in json_dict['considerations']['limitations']
-    ]
-  if 'considerations' in json_dict and 'tradeoffs' in json_dict[
-      'considerations']:
-    json_dict['considerations']['tradeoffs'] = [
-        {
-            'description': limitation
-        } for limitation in json_dict['considerations']['tradeoffs']
-    ]
+  considerations = json_dict.get('considerations')
+  if considerations is not None:
+    for field in ('use_cases', 'users', 'limitations', 'tradeoffs'):
+      if field in considerations:
+        considerations[field] = [
+            {
+                'description': description
+            } for description in considerations[field]
+        ]
 
   return json_dict
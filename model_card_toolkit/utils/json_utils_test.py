@@ -237,7 +237,19 @@ class JsonUtilsTest(parameterized.TestCase):
     json_data = json.loads(
         pkgutil.get_data("model_card_toolkit", template_path)
     )
-    json_utils.validate_json_schema(json_data)
+    json_utils.get_validator("0.0.2").validate(json_data)
+
+  def test_get_validator(self):
+    self.assertIs(
+        json_utils.get_validator(), json_utils.get_validator("0.0.2")
+    )
+    self.assertTrue(
+        json_utils.get_validator("0.0.1").is_valid(
+            json.loads(_CATS_VS_DOGS_V1_TEXT)
+        )
+    )
+    with self.assertRaises(ValueError):
+      json_utils.get_validator("100.0.0")
 
   def test_json_update_succeeds(self):
 
@@ -300,6 +312,14 @@ class JsonUtilsTest(parameterized.TestCase):
   def test_json_update_validation_error(self):
     with self.assertRaises(jsonschema.ValidationError):
       json_utils.update(json_dict={"model_name": "the_greatest_model"})
+    with self.assertRaises(jsonschema.ValidationError):
+      json_utils.update()
+
+  def test_json_update_invalid_latest_version_is_not_updated(self):
+    json_dict = {"schema_version": "0.0.2", "model_details": {"name": 1}}
+    with self.assertRaises(jsonschema.ValidationError):
+      json_utils.update(json_dict=json_dict)
+    self.assertEqual(json_dict["schema_version"], "0.0.2")
 
 
 if __name__ == "__main__":
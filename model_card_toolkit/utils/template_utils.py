@@ -14,6 +14,7 @@
 # ==============================================================================
 """Utilities for rendering model cards."""
 
+import functools
 import os
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
@@ -28,12 +29,14 @@ import jinja2
 from model_card_toolkit.utils import io_utils
 
 
+@functools.lru_cache(maxsize=None)
 def default_html_template() -> Path:
   """Returns the path to the default HTML template."""
   return files('model_card_toolkit'
                ).joinpath('template', 'html', 'default_template.html.jinja')
 
 
+@functools.lru_cache(maxsize=None)
 def default_md_template() -> Path:
   """Returns the path to the default Markdown template."""
   return files('model_card_toolkit'
@@ -44,6 +47,7 @@ def render(
     template_path: Union[Path, str],
     output_path: Optional[Union[Path, str]] = None,
     template_variables: Optional[Dict[str, Any]] = None,
+    stream: bool = False,
 ) -> str:
   """Renders a Jinja template and returns the content as a string.
 
@@ -53,20 +57,45 @@ def render(
       the rendered template will not be written to a file. If the file already
       exists, it will be overwritten.
     template_variables: A dictionary of variables to pass to the template.
+    stream: If True, the template is written to output_path as it is rendered,
+      without holding the whole rendered content in memory. Requires
+      output_path. Defaults to False.
+
+  Returns:
+    The rendered template, or an empty string if stream is True.
+
+  Raises:
+    ValueError: If stream is True and output_path is not provided.
   """
+  if stream and not output_path:
+    raise ValueError('output_path is required to stream a rendered template.')
   template_variables = template_variables or {}
-  template_dir = os.path.dirname(template_path)
+  template_dir = os.path.abspath(os.path.dirname(template_path))
   template_file = os.path.basename(template_path)
-  jinja_env = jinja2.Environment(
-      loader=jinja2.FileSystemLoader(template_dir),
-      autoescape=True,
-      auto_reload=True,
-      cache_size=0,
-  )
+  template = _jinja_environment(template_dir).get_template(template_file)
+  if stream:
+    io_utils.write_file(output_path, template.generate(template_variables))
+    return ''
 
-  template = jinja_env.get_template(template_file)
   content = template.render(template_variables)
   if output_path:
     io_utils.write_file(output_path, content)
 
   return content
+
+
+@functools.lru_cache(maxsize=32)
+def _jinja_environment(template_dir: str) -> jinja2.Environment:
+  """Returns the Jinja environment for the templates in a directory.
+
+  Environments are shared between renders, so that a template is only compiled
+  again if its file was modified since it was last rendered.
+
+  Args:
+    template_dir: The absolute path of a directory of Jinja templates.
+  """
+  return jinja2.Environment(
+      loader=jinja2.FileSystemLoader(template_dir),
+      autoescape=True,
+      auto_reload=True,
+  )
@@ -37,6 +37,37 @@ class TemplateUtilsTest(absltest.TestCase):
       self.assertEqual(content, read_content)
       self.assertEqual(content, 'Hello, World!')
 
+  def test_render_stream(self):
+    with tempfile.TemporaryDirectory() as test_dir:
+      template_path = os.path.join(test_dir, 'test.txt.jinja')
+      io_utils.write_file(template_path, '{{ greeting }}, World!')
+      output_path = os.path.join(test_dir, 'output', 'test.txt')
+      content = template_utils.render(
+          template_path=template_path, output_path=output_path,
+          template_variables={'greeting': 'Hello'}, stream=True
+      )
+      self.assertEqual(content, '')
+      self.assertEqual(io_utils.read_file(output_path), 'Hello, World!')
+      with self.assertRaises(ValueError):
+        template_utils.render(template_path=template_path, stream=True)
+
+  def test_render_modified_template(self):
+    with tempfile.TemporaryDirectory() as test_dir:
+      template_path = os.path.join(test_dir, 'test.txt.jinja')
+      io_utils.write_file(template_path, 'Hello, {{ name }}!')
+      content = template_utils.render(
+          template_path, template_variables={'name': 'A'}
+      )
+      self.assertEqual(content, 'Hello, A!')
+      io_utils.write_file(template_path, 'Goodbye, {{ name }}!')
+      # Make sure the modification time changes on coarse-grained filesystems.
+      mtime = os.path.getmtime(template_path) + 1
+      os.utime(template_path, (mtime, mtime))
+      content = template_utils.render(
+          template_path, template_variables={'name': 'A'}
+      )
+      self.assertEqual(content, 'Goodbye, A!')
+
 
 if __name__ == '__main__':
   absltest.main()
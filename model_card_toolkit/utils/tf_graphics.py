@@ -13,8 +13,11 @@
 # limitations under the License.
 """Utilities for generating model card plots/graphics for TensorFlow models."""
 
+import collections
+import hashlib
 import logging
-from typing import Optional, Sequence, Union
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import tensorflow_model_analysis as tfma
 from tensorflow_metadata.proto.v0 import statistics_pb2
@@ -22,10 +25,18 @@ from tensorflow_metadata.proto.v0 import statistics_pb2
 from model_card_toolkit import model_card as model_card_module
 from model_card_toolkit.utils import graphics
 
+# An LRU cache of (name, base64 image) of drawn feature histograms, keyed by a
+# digest of the feature statistics and the color they were drawn with. It is
+# only accessed while holding _FEATURE_GRAPHIC_CACHE_LOCK.
+_FEATURE_GRAPHIC_CACHE = collections.OrderedDict()
+_FEATURE_GRAPHIC_CACHE_LOCK = threading.Lock()
+_FEATURE_GRAPHIC_CACHE_SIZE = 256
+
 
 def annotate_dataset_feature_statistics_plots(
     model_card: model_card_module.ModelCard,
-    data_stats: Sequence[statistics_pb2.DatasetFeatureStatisticsList]
+    data_stats: Sequence[statistics_pb2.DatasetFeatureStatisticsList],
+    max_workers: Optional[int] = None
 ) -> None:
   """Annotates visualizations for every dataset and feature.
 
@@ -34,40 +45,104 @@ def annotate_dataset_feature_statistics_plots(
   and encoded as base64 text strings. They can be found in the Dataset.graphics
   field.
 
+  Identical feature statistics, e.g. a feature shared by the train and eval
+  splits or a model card that is regenerated, are only drawn and encoded once.
+
   Args:
     model_card: The model card object.
     data_stats: A list of DatasetFeatureStatisticsList related to the dataset.
+    max_workers: The number of processes to draw histograms in; see
+      `graphics.draw_histograms`. By default, they are drawn in this process.
   """
   colors = (
       graphics._COLOR_PALETTE['material_teal_700'],
       graphics._COLOR_PALETTE['material_indigo_400']
   )
+  datasets = []
+  graphics_by_key = {}
+  graphs_to_draw = {}
   for stats, color in zip(data_stats, colors):
     if not stats:
       continue
     for dataset in stats.datasets:
-      graphs = []
+      keys = []
       for feature in dataset.features:
+        key = _feature_graphic_key(feature, color)
+        keys.append(key)
+        if key in graphics_by_key or key in graphs_to_draw:
+          continue
+        graphic = _get_cached_feature_graphic(key)
+        if graphic is not None:
+          graphics_by_key[key] = graphic
+          continue
         graph = _extract_graph_data_from_dataset_feature_statistics(
             feature, color
         )
-        graph = graphics.draw_histogram(graph)
         if graph is not None:
-          graphs.append(
-              model_card_module.Graphic(
-                  name=graph.name, image=graph.base64str
-              )
-          )
-      model_card.model_parameters.data.append(
-          model_card_module.Dataset(
-              name=dataset.name,
-              graphics=model_card_module.GraphicsCollection(collection=graphs)
-          )
-      )
+          graphs_to_draw[key] = graph
+      datasets.append((dataset.name, keys))
+
+  drawn_graphs = graphics.draw_histograms(
+      list(graphs_to_draw.values()), max_workers
+  )
+  for key, graph in zip(graphs_to_draw, drawn_graphs):
+    if graph is None:
+      continue
+    graphic = (graph.name, graph.base64str)
+    graphics_by_key[key] = graphic
+    _cache_feature_graphic(key, graphic)
+
+  for name, keys in datasets:
+    graphs = [
+        model_card_module.Graphic(name=graphic[0], image=graphic[1])
+        for graphic in map(graphics_by_key.get, keys) if graphic is not None
+    ]
+    model_card.model_parameters.data.append(
+        model_card_module.Dataset(
+            name=name,
+            graphics=model_card_module.GraphicsCollection(collection=graphs)
+        )
+    )
+
+
+def _get_cached_feature_graphic(key: bytes) -> Optional[Tuple[str, str]]:
+  """Returns the cached (name, base64 image) of a feature histogram, if any."""
+  with _FEATURE_GRAPHIC_CACHE_LOCK:
+    graphic = _FEATURE_GRAPHIC_CACHE.get(key)
+    if graphic is not None:
+      _FEATURE_GRAPHIC_CACHE.move_to_end(key)
+    return graphic
+
+
+def _cache_feature_graphic(key: bytes, graphic: Tuple[str, str]) -> None:
+  """Caches the (name, base64 image) of a feature histogram."""
+  with _FEATURE_GRAPHIC_CACHE_LOCK:
+    _FEATURE_GRAPHIC_CACHE[key] = graphic
+    _FEATURE_GRAPHIC_CACHE.move_to_end(key)
+    if len(_FEATURE_GRAPHIC_CACHE) > _FEATURE_GRAPHIC_CACHE_SIZE:
+      _FEATURE_GRAPHIC_CACHE.popitem(last=False)
+
+
+def _feature_graphic_key(
+    feature_stats: statistics_pb2.FeatureNameStatistics, color: str
+) -> bytes:
+  """Returns the key of a feature histogram in _FEATURE_GRAPHIC_CACHE.
+
+  Args:
+    feature_stats: a FeatureNameStatistics proto.
+    color: the colors of the barchart.
+
+  Returns:
+    A digest of feature_stats and color.
+  """
+  return hashlib.blake2b(
+      feature_stats.SerializeToString(deterministic=True) + color.encode()
+  ).digest()
 
 
 def annotate_eval_result_plots(
-    model_card: model_card_module.ModelCard, eval_result: tfma.EvalResult
+    model_card: model_card_module.ModelCard, eval_result: tfma.EvalResult,
+    max_workers: Optional[int] = None
 ) -> None:
   """Annotates visualizations for every metric in eval_result.
 
@@ -78,37 +153,34 @@ def annotate_eval_result_plots(
   Args:
     model_card: The model card object.
     eval_result: A `tfma.EvalResult`.
+    max_workers: The number of processes to draw barcharts in; see
+      `graphics.draw_histograms`. By default, they are drawn in this process.
   """
 
   # get all metric and slice names
   metrics = set()
-  slices_keys = set()
   for slicing_metric in eval_result.slicing_metrics:
-    slices_key, _ = graphics.stringify_slice_key(slicing_metric[0])
-    if slices_key != 'Overall':
-      slices_keys.add(slices_key)
     for output_name in slicing_metric[1]:
       for sub_key in slicing_metric[1][output_name]:
         metrics.update(slicing_metric[1][output_name][sub_key].keys())
+  slice_index = _index_slicing_metrics(eval_result.slicing_metrics)
+  slices_keys = set(slice_index) - {''} or {''}
 
   # generate barcharts based on metrics and slices
-  graphs = []
-  if not slices_keys:
-    slices_keys.add('')
-  for metric in metrics:
-    for slices_key in slices_keys:
-      graph = _extract_graph_data_from_slicing_metrics(
-          eval_result.slicing_metrics, metric, slices_key
-      )
-      graph = graphics.draw_histogram(graph)
-      if graph is not None:
-        graphs.append(graph)
+  graphs = [
+      _extract_graph_data_from_slices(
+          slice_index[slices_key], metric, slices_key
+      ) for metric in metrics for slices_key in slices_keys
+  ]
+  graphs = graphics.draw_histograms(
+      [graph for graph in graphs if graph is not None], max_workers
+  )
 
   # annotate model_card with generated graphs
   model_card.quantitative_analysis.graphics.collection.extend(
       [
           model_card_module.Graphic(name=graph.name, image=graph.base64str)
-          for graph in graphs
+          for graph in graphs if graph is not None
       ]
   )
 
@@ -134,35 +206,36 @@ def _extract_graph_data_from_dataset_feature_statistics(
     Graph or None if feature_stats is not num_stats or string_stats.
   """
   feature_name = feature_stats.name or feature_stats.path.step[0]
+  title = f'counts | {feature_name}' if feature_name else 'counts'
   graph = graphics.Graph()
 
-  if feature_stats.HasField(
-      'num_stats'
-  ) and feature_stats.num_stats.histograms:
+  histograms = feature_stats.num_stats.histograms
+  if feature_stats.HasField('num_stats') and histograms:
     # Only generate graph for the first histogram.
     # The second one is QUANTILES graph.
-    histogram = feature_stats.num_stats.histograms[0]
-    graph.x = [int(bucket.sample_count) for bucket in histogram.buckets]
+    histogram = histograms[0]
+    # Read the counts and labels off each bucket in a single pass.
+    graph.x = []
+    graph.y = []
+    for bucket in histogram.buckets:
+      graph.x.append(int(bucket.sample_count))
+      graph.y.append(f'{bucket.low_value:.2f}-{bucket.high_value:.2f}')
     graph.xlabel = 'counts'
-    graph.y = [
-        f'{bucket.low_value:.2f}-{bucket.high_value:.2f}'
-        for bucket in histogram.buckets
-    ]
     graph.ylabel = 'buckets'
-    graph.title = f'counts | {feature_name}' if feature_name else 'counts'
-    graph.name = f'counts | {feature_name}' if feature_name else 'counts'
+    graph.title = graph.name = title
     if color:
       graph.color = color
     return graph
 
   if feature_stats.HasField('string_stats'):
-    rank_histogram = feature_stats.string_stats.rank_histogram
-    graph.x = [int(bucket.sample_count) for bucket in rank_histogram.buckets]
+    graph.x = []
+    graph.y = []
+    for bucket in feature_stats.string_stats.rank_histogram.buckets:
+      graph.x.append(int(bucket.sample_count))
+      graph.y.append(bucket.label)
     graph.xlabel = 'counts'
-    graph.y = [bucket.label for bucket in rank_histogram.buckets]
     graph.ylabel = 'buckets'
-    graph.title = f'counts | {feature_name}' if feature_name else 'counts'
-    graph.name = f'counts | {feature_name}' if feature_name else 'counts'
+    graph.title = graph.name = title
     if color:
       graph.color = color
     return graph
@@ -174,30 +247,58 @@ def _extract_graph_data_from_dataset_feature_statistics(
   return None
 
 
-def _extract_graph_data_from_slicing_metrics(
-    slicing_metrics: Sequence[tfma.view.SlicedMetrics],
+def _index_slicing_metrics(
+    slicing_metrics: Sequence[tfma.view.SlicedMetrics]
+) -> Dict[str, List[Tuple[str, Dict]]]:
+  """Groups slicing metrics by their stringified slices key.
+
+  Each slice key is stringified only once, so that the graphs of every metric
+  can look up their slices rather than rescanning all of slicing_metrics.
+
+  Args:
+    slicing_metrics: A sequence of `tfma.view.SlicedMetrics` objects, where each
+      `tfma.view.SlicedMetrics` corresponds to a different slice.
+
+  Returns:
+    A dict from each slices_key in slicing_metrics, other than 'Overall', to
+    the (slice value, metrics) pairs of that slices_key and of the overall
+    slice, in their original order. The '' key maps to every slice.
+  """
+  slices = [
+      graphics.stringify_slice_key(slice_key) + (metrics, )
+      for slice_key, metrics in slicing_metrics
+  ]
+  slice_index = {'': [(value, metrics) for _, value, metrics in slices]}
+  for slices_key in {key for key, _, _ in slices if key != 'Overall'}:
+    slice_index[slices_key] = [
+        (value, metrics) for key, value, metrics in slices
+        if key in (slices_key, 'Overall')
+    ]
+  return slice_index
+
+
+def _extract_graph_data_from_slices(
+    slices: Sequence[Tuple[str, Dict]],
     metric: str,
     slices_key: str = '',
     output_name: str = '',
     sub_key: str = '',
 ) -> Optional[graphics.Graph]:
-  """Generates a barchart for a metric.
-
-  Each bar in the barchart represents a slice in slicing_metrics. The size of
-  a bar indicates the value of the metric for that slice.
+  """Generates a barchart for a metric from already selected slices.
 
   Args:
-    slicing_metrics: A sequence of `tfma.view.SlicedMetrics` objects, where each
-      `tfma.view.SlicedMetrics` corresponds to a different slice.
+    slices: The (slice value, metrics) pairs to draw, as grouped by
+      `_index_slicing_metrics`.
     metric: The name of a metric.
-    slices_key: Only the slices with this slices_key will be added into graph.
-      If it's an empty string, then all the the slices will be included.
+    slices_key: The slices_key that slices were selected by, or '' if they are
+      all the slices.
     output_name: The output_name of interest in the slicing_metrics. '' by
       default.
     sub_key: The sub_key of interest in the slicing_metrics. '' by default.
 
   Returns:
     A Graph object, or None if any of the following are true:
+      * a slice does not have the metric.
       * metrics values format are not doubleValue or boundedValue.
       * the metric name ends with "_diff".
       * the metric name is "__ERROR__".
@@ -206,39 +307,39 @@ def _extract_graph_data_from_slicing_metrics(
     return None
 
   metric_values = []
-  bounds = []
+  # The distances from each metric value to its lower and upper bounds.
+  lower_errors = []
+  upper_errors = []
   slice_values = []
   has_bounded_value = False
-  for slicing_metric in slicing_metrics:
-    key, value = graphics.stringify_slice_key(slicing_metric[0])
-    if key != 'Overall' and slices_key and key != slices_key:
-      continue
+  for value, metrics in slices:
     slice_values.append(value)
 
     if (
-        output_name not in slicing_metric[1]
-        or sub_key not in slicing_metric[1][output_name]
-        or metric not in slicing_metric[1][output_name][sub_key]
+        output_name not in metrics or sub_key not in metrics[output_name]
+        or metric not in metrics[output_name][sub_key]
     ):
       logging.warning(
           '%s, %s, %s not in %s. Skipping %s', output_name, sub_key, metric,
-          slicing_metric[1], slices_key
+          metrics, slices_key
       )
       return None
 
     # https://www.tensorflow.org/tfx/model_analysis/metrics#metric_value
-    metric_value = slicing_metric[1][output_name][sub_key][metric]
+    metric_value = metrics[output_name][sub_key][metric]
     if 'doubleValue' in metric_value:
       metric_values.append(metric_value['doubleValue'])
-      bounds.append((metric_value['doubleValue'], metric_value['doubleValue']))
+      lower_errors.append(0.0)
+      upper_errors.append(0.0)
     elif 'boundedValue' in metric_value:
       has_bounded_value = True
-      metric_values.append(metric_value['boundedValue']['value'])
-      bounds.append(
-          (
-              metric_value['boundedValue']['lowerBound'],
-              metric_value['boundedValue']['upperBound']
-          )
+      bounded_value = metric_value['boundedValue']
+      metric_values.append(bounded_value['value'])
+      lower_errors.append(
+          float(bounded_value['value']) - float(bounded_value['lowerBound'])
+      )
+      upper_errors.append(
+          float(bounded_value['upperBound']) - float(bounded_value['value'])
       )
     else:
       logging.warning(
@@ -251,19 +352,11 @@ def _extract_graph_data_from_slicing_metrics(
   graph.x = metric_values
   graph.y = slice_values
   if has_bounded_value:
-    graph.xerr = [
-        [
-            float(metric_value) - float(bound[0])
-            for metric_value, bound in zip(metric_values, bounds)
-        ],
-        [
-            float(bound[1]) - float(metric_value)
-            for metric_value, bound in zip(metric_values, bounds)
-        ],
-    ]
+    graph.xerr = [lower_errors, upper_errors]
   graph.xlabel = metric
   graph.ylabel = 'slices'
-  graph.name = f'{metric} | {slices_key}' if slices_key else metric
-  graph.title = f'{metric} | {slices_key}' if slices_key else metric
+  graph.name = graph.title = (
+      f'{metric} | {slices_key}' if slices_key else metric
+  )
   graph.color = graphics._COLOR_PALETTE['material_purple_500']
   return graph
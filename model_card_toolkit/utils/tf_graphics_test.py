@@ -14,6 +14,7 @@
 """Tests for model_card_toolkit.utils.tf_graphics."""
 
 import logging
+from unittest import mock
 
 import tensorflow_model_analysis as tfma
 from absl.testing import absltest
@@ -26,17 +27,10 @@ from model_card_toolkit.utils import graphics, tf_graphics
 
 class TfGraphicsTest(absltest.TestCase):
   def assertGraphEqual(self, g: graphics.Graph, h: graphics.Graph):
-    self.assertSequenceEqual(g.x, h.x)
-    self.assertSequenceEqual(g.y, h.y)
-    if g.xerr and h.xerr:
-      self.assertSequenceEqual(g.xerr, h.xerr)
-    else:
-      self.assertEqual(g.xerr, h.xerr)
-    self.assertEqual(g.xlabel, h.xlabel)
-    self.assertEqual(g.ylabel, h.ylabel)
-    self.assertEqual(g.title, h.title)
-    self.assertEqual(g.name, h.name)
-    self.assertEqual(g.color, h.color)
+    fields = ('x', 'y', 'xerr', 'xlabel', 'ylabel', 'title', 'name', 'color')
+    g_fields = {field: getattr(g, field) for field in fields}
+    h_fields = {field: getattr(h, field) for field in fields}
+    self.assertEqual(g_fields, h_fields)
 
   def test_extract_graph_data_from_dataset_feature_statistics(self):
     empty_numeric_feature_stats = text_format.Parse(
@@ -148,6 +142,48 @@ class TfGraphicsTest(absltest.TestCase):
         )
     )
 
+  def test_annotate_dataset_feature_statistics_plots_is_cached(self):
+    data_stats = text_format.Parse(
+        """
+        datasets {
+          features {
+            path {
+              step: "string_feature"
+            }
+            type: STRING
+            string_stats {
+              rank_histogram {
+                buckets {
+                  label: 'News'
+                  sample_count: 1387.0
+                }
+              }
+            }
+          }
+        }""", statistics_pb2.DatasetFeatureStatisticsList()
+    )
+    color = graphics._COLOR_PALETTE['material_teal_700']
+    key = tf_graphics._feature_graphic_key(
+        data_stats.datasets[0].features[0], color
+    )
+    tf_graphics._FEATURE_GRAPHIC_CACHE.pop(key, None)
+    model_card = model_card_module.ModelCard()
+    tf_graphics.annotate_dataset_feature_statistics_plots(
+        model_card, [data_stats]
+    )
+    graphic = model_card.model_parameters.data[0].graphics.collection[0]
+    self.assertEqual(
+        tf_graphics._FEATURE_GRAPHIC_CACHE[key], (graphic.name, graphic.image)
+    )
+    with mock.patch.object(graphics, 'draw_histogram') as draw_histogram:
+      tf_graphics.annotate_dataset_feature_statistics_plots(
+          model_card, [data_stats]
+      )
+      draw_histogram.assert_not_called()
+    self.assertEqual(
+        model_card.model_parameters.data[1].graphics.collection, [graphic]
+    )
+
   def test_annotate_dataset_feature_statistics_plots(self):
     train_stats = text_format.Parse(
         """
@@ -328,23 +364,19 @@ class TfGraphicsTest(absltest.TestCase):
     self.assertLen(model_card.model_parameters.data, 2)
 
     train_data = model_card.model_parameters.data[0]
-    self.assertSameElements(
-        [g.name for g in train_data.graphics.collection],
-        expected_plot_names_train
-    )
+    plot_names_train = {g.name for g in train_data.graphics.collection}
+    self.assertEqual(plot_names_train, expected_plot_names_train)
 
     eval_data = model_card.model_parameters.data[1]
-    self.assertSameElements(
-        [g.name for g in eval_data.graphics.collection],
-        expected_plot_names_eval
-    )
+    plot_names_eval = {g.name for g in eval_data.graphics.collection}
+    self.assertEqual(plot_names_eval, expected_plot_names_eval)
 
     graphs = train_data.graphics.collection + eval_data.graphics.collection
     for graph in graphs:
       logging.info('%s: %s', graph.name, graph.image)
       self.assertNotEmpty(graph.image, f'feature {graph.name} has empty plot')
 
-  def test_extract_graph_data_from_slicing_metrics(self):
+  def test_extract_graph_data_from_slices(self):
     slicing_metrics = [
         (
             (('weekday', 0), ), {
@@ -422,9 +454,10 @@ class TfGraphicsTest(absltest.TestCase):
             }
         )
     ]
+    slice_index = tf_graphics._index_slicing_metrics(slicing_metrics)
     self.assertGraphEqual(
-        tf_graphics._extract_graph_data_from_slicing_metrics(
-            slicing_metrics, 'average_loss'
+        tf_graphics._extract_graph_data_from_slices(
+            slice_index[''], 'average_loss'
         ),
         graphics.Graph(
             x=[
@@ -436,8 +469,8 @@ class TfGraphicsTest(absltest.TestCase):
         )
     )
     self.assertGraphEqual(
-        tf_graphics._extract_graph_data_from_slicing_metrics(
-            slicing_metrics, 'average_loss', 'weekday'
+        tf_graphics._extract_graph_data_from_slices(
+            slice_index['weekday'], 'average_loss', 'weekday'
         ),
         graphics.Graph(
             x=[
@@ -449,8 +482,8 @@ class TfGraphicsTest(absltest.TestCase):
         )
     )
     self.assertGraphEqual(
-        tf_graphics._extract_graph_data_from_slicing_metrics(
-            slicing_metrics, 'prediction/mean'
+        tf_graphics._extract_graph_data_from_slices(
+            slice_index[''], 'prediction/mean'
         ),
         graphics.Graph(
             x=[
@@ -465,8 +498,8 @@ class TfGraphicsTest(absltest.TestCase):
     )
 
     self.assertGraphEqual(
-        tf_graphics._extract_graph_data_from_slicing_metrics(
-            slicing_metrics, 'prediction/mean', 'weekday'
+        tf_graphics._extract_graph_data_from_slices(
+            slice_index['weekday'], 'prediction/mean', 'weekday'
         ),
         graphics.Graph(
             x=[
@@ -480,6 +513,32 @@ class TfGraphicsTest(absltest.TestCase):
             name='prediction/mean | weekday', color='#A142F4'
         )
     )
+    self.assertIsNone(
+        tf_graphics._extract_graph_data_from_slices(
+            slice_index[''], '__ERROR__'
+        )
+    )
+
+  def test_index_slicing_metrics(self):
+    metrics_a, metrics_b, metrics_c, overall = {'a': 1}, {'b': 2}, {'c': 3}, {}
+    slicing_metrics = [
+        ((('weekday', 0), ), metrics_a),
+        ((), overall),
+        ((('hour', 1), ), metrics_b),
+        ((('weekday', 1), ), metrics_c),
+    ]
+    self.assertEqual(
+        tf_graphics._index_slicing_metrics(slicing_metrics), {
+            '': [
+                ('0', metrics_a), ('Overall', overall), ('1', metrics_b),
+                ('1', metrics_c)
+            ],
+            'weekday': [
+                ('0', metrics_a), ('Overall', overall), ('1', metrics_c)
+            ],
+            'hour': [('Overall', overall), ('1', metrics_b)],
+        }
+    )
 
   def test_annotate_eval_results_plots(self):
     slicing_metrics = [
@@ -612,12 +671,11 @@ class TfGraphicsTest(absltest.TestCase):
         'average_loss | weekday', 'prediction/mean | weekday',
         'average_loss | gender, age', 'prediction/mean | gender, age'
     }
-    self.assertSameElements(
-        expected_metrics_names,
-        [g.name for g in model_card.quantitative_analysis.graphics.collection]
-    )
+    graphics_collection = model_card.quantitative_analysis.graphics.collection
+    metrics_names = {g.name for g in graphics_collection}
+    self.assertEqual(expected_metrics_names, metrics_names)
 
-    for graph in model_card.quantitative_analysis.graphics.collection:
+    for graph in graphics_collection:
       logging.info('%s: %s', graph.name, graph.image)
       self.assertNotEmpty(graph.image, f'feature {graph.name} has empty plot')
 
@@ -18,10 +18,33 @@ populate a ModelCard.
 """
 
 import dataclasses
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-import ml_metadata as mlmd
-from ml_metadata.proto import metadata_store_pb2
+if TYPE_CHECKING:
+  # ml_metadata is only needed for type annotations, so it is not imported at
+  # runtime.
+  import ml_metadata as mlmd
+  from ml_metadata.proto import metadata_store_pb2
+
+
+def _paths_or_artifact_uris(
+    paths: List[str], artifacts: List['metadata_store_pb2.Artifact'],
+    error_message: str
+) -> List[str]:
+  """Returns paths, or the URIs of artifacts if no paths are given.
+
+  Args:
+    paths: The paths given to a source.
+    artifacts: The MLMD artifacts given to a source instead of paths.
+    error_message: The message of the error raised if the source was not given
+      exactly one of paths and artifacts.
+
+  Raises:
+    ValueError: If both or neither of paths and artifacts are given.
+  """
+  if bool(paths) == bool(artifacts):
+    raise ValueError(error_message)
+  return paths or [artifact.uri for artifact in artifacts]
 
 
 @dataclasses.dataclass
@@ -33,7 +56,7 @@ class MlmdSource:
       information about the model.
     model_uri: The path to the trained model used to generate the model card.
   """
-  store: mlmd.MetadataStore
+  store: 'mlmd.MetadataStore'
   model_uri: str
 
 
@@ -57,23 +80,17 @@ class TfmaSource:
   """
   eval_result_paths: List[str] = dataclasses.field(default_factory=list)
   file_format: Optional[str] = ''
-  model_evaluation_artifacts: List[metadata_store_pb2.Artifact
+  model_evaluation_artifacts: List['metadata_store_pb2.Artifact'
                                    ] = dataclasses.field(default_factory=list)
   metrics_include: List[str] = dataclasses.field(default_factory=list)
   metrics_exclude: List[str] = dataclasses.field(default_factory=list)
 
   def __post_init__(self):
-    if self.eval_result_paths and not self.model_evaluation_artifacts:
-      pass
-    elif self.model_evaluation_artifacts and not self.eval_result_paths:
-      self.eval_result_paths = [
-          artifact.uri for artifact in self.model_evaluation_artifacts
-      ]
-    else:
-      raise ValueError(
-          'TfmaSource needs exactly one of eval_result_paths or '
-          'model_evaluation_artifact'
-      )
+    self.eval_result_paths = _paths_or_artifact_uris(
+        self.eval_result_paths, self.model_evaluation_artifacts,
+        'TfmaSource needs exactly one of eval_result_paths or '
+        'model_evaluation_artifact'
+    )
 
     if self.metrics_include and self.metrics_exclude:
       raise ValueError(
@@ -102,26 +119,17 @@ class TfdvSource:
       features_include.
   """
   dataset_statistics_paths: List[str] = dataclasses.field(default_factory=list)
-  example_statistics_artifacts: List[metadata_store_pb2.Artifact
-                                     ] = dataclasses.field(
-                                         default_factory=list
-                                     )
+  example_statistics_artifacts: List[
+      'metadata_store_pb2.Artifact'] = dataclasses.field(default_factory=list)
   features_include: List[str] = dataclasses.field(default_factory=list)
   features_exclude: List[str] = dataclasses.field(default_factory=list)
 
   def __post_init__(self):
-    if self.dataset_statistics_paths and not self.example_statistics_artifacts:
-      pass
-    elif self.example_statistics_artifacts \
-      and not self.dataset_statistics_paths:
-      self.dataset_statistics_paths = [
-          artifact.uri for artifact in self.example_statistics_artifacts
-      ]
-    else:
-      raise ValueError(
-          'TfdvSource needs exactly one of dataset_statistics_paths or '
-          'example_statistics_artifacts'
-      )
+    self.dataset_statistics_paths = _paths_or_artifact_uris(
+        self.dataset_statistics_paths, self.example_statistics_artifacts,
+        'TfdvSource needs exactly one of dataset_statistics_paths or '
+        'example_statistics_artifacts'
+    )
 
     if self.features_include and self.features_exclude:
       raise ValueError(
@@ -141,18 +149,16 @@ class ModelSource:
     pushed_model_artifact: The MLMD artifact for a PushedModel.
   """
   pushed_model_path: Optional[str] = ''
-  pushed_model_artifact: Optional[metadata_store_pb2.Artifact] = None
+  pushed_model_artifact: Optional['metadata_store_pb2.Artifact'] = None
 
   def __post_init__(self):
-    if self.pushed_model_path and not self.pushed_model_artifact:
-      pass
-    elif self.pushed_model_artifact and not self.pushed_model_path:
-      self.pushed_model_path = self.pushed_model_artifact.uri
-    else:
+    if bool(self.pushed_model_path) == bool(self.pushed_model_artifact):
       raise ValueError(
           'ModelSource needs exactly one of pushed_model_path or '
           'pushed_model_artifact.'
       )
+    if self.pushed_model_artifact:
+      self.pushed_model_path = self.pushed_model_artifact.uri
 
 
 @dataclasses.dataclass
@@ -13,9 +13,13 @@
 # limitations under the License.
 """Utilities for reading metadata from MLMD instances in TFX-OSS pipelines."""
 
+import concurrent.futures
 import enum
 import os
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+import weakref
+from typing import (
+    AbstractSet, Any, Dict, Iterable, List, Optional, Sequence, TypeVar, Union
+)
 
 import attr
 import ml_metadata as mlmd
@@ -35,6 +39,15 @@ _TFX_MODEL_TYPE = 'Model'
 _TFX_METRICS_TYPE = 'ModelEvaluation'
 _TFX_TRAINER_TYPE = 'tfx.components.trainer.component.Trainer'
 
+# The types a store must have to be considered a valid TFX store.
+_EXPECTED_ARTIFACT_TYPES = frozenset(
+    (_TFX_DATASET_TYPE, _TFX_STATS_TYPE, _TFX_MODEL_TYPE, _TFX_METRICS_TYPE)
+)
+_EXPECTED_EXECUTION_TYPES = frozenset((_TFX_TRAINER_TYPE, ))
+
+# The maximum number of threads reading the splits of a stats artifact.
+_MAX_READ_WORKERS = 16
+
 # Map of data types to field names in a TFMA arrayValue
 _TYPE_FIELD_MAP = {
     'BYTES': 'bytesValues',
@@ -44,6 +57,11 @@ _TYPE_FIELD_MAP = {
     'FLOAT64': 'float64Values'
 }
 
+_MlmdType = TypeVar(
+    '_MlmdType', metadata_store_pb2.ArtifactType,
+    metadata_store_pb2.ExecutionType
+)
+
 
 @attr.s(auto_attribs=True)
 class PipelineTypes(object):
@@ -57,9 +75,18 @@ class PipelineTypes(object):
   trainer_type: metadata_store_pb2.ExecutionType
 
 
+# The PipelineTypes found in each store, so the types of a store are only
+# fetched once however many models are looked up in it. Entries are dropped
+# along with their stores.
+_PIPELINE_TYPES_CACHE = weakref.WeakKeyDictionary()
+
+
 def _get_tfx_pipeline_types(store: mlmd.MetadataStore) -> PipelineTypes:
   """Retrieves the registered types in the given `store`.
 
+  The types are cached for as long as `store` is alive, as registered types are
+  never removed from a store.
+
   Args:
     store: A ml-metadata MetadataStore to retrieve ArtifactTypes from.
 
@@ -70,37 +97,62 @@ def _get_tfx_pipeline_types(store: mlmd.MetadataStore) -> PipelineTypes:
     ValueError: If the `store` does not have MCT related types and is not
       considered a valid TFX store.
   """
-  artifact_types = {atype.name: atype for atype in store.get_artifact_types()}
-  expected_artifact_types = {
-      _TFX_DATASET_TYPE, _TFX_STATS_TYPE, _TFX_MODEL_TYPE, _TFX_METRICS_TYPE
-  }
-  missing_types = expected_artifact_types.difference(artifact_types.keys())
+  try:
+    return _PIPELINE_TYPES_CACHE[store]
+  except KeyError:
+    pass
+  artifact_types = _find_types_by_name(
+      store.get_artifact_types(), _EXPECTED_ARTIFACT_TYPES
+  )
+  missing_types = _EXPECTED_ARTIFACT_TYPES.difference(artifact_types)
   if missing_types:
     raise ValueError(
-        f'Given `store` is invalid: missing ArtifactTypes: {missing_types}.'
+        'Given `store` is invalid: missing ArtifactTypes: '
+        f'{sorted(missing_types)}.'
     )
-  execution_types = {
-      etype.name: etype
-      for etype in store.get_execution_types()
-  }
-  expected_execution_types = {_TFX_TRAINER_TYPE}
-  missing_types = expected_execution_types.difference(execution_types.keys())
+  execution_types = _find_types_by_name(
+      store.get_execution_types(), _EXPECTED_EXECUTION_TYPES
+  )
+  missing_types = _EXPECTED_EXECUTION_TYPES.difference(execution_types)
   if missing_types:
     raise ValueError(
-        f'Given `store` is invalid: missing ExecutionTypes: {missing_types}.'
+        'Given `store` is invalid: missing ExecutionTypes: '
+        f'{sorted(missing_types)}.'
     )
-  return PipelineTypes(
+  pipeline_types = PipelineTypes(
       dataset_type=artifact_types[_TFX_DATASET_TYPE],
       stats_type=artifact_types[_TFX_STATS_TYPE],
       model_type=artifact_types[_TFX_MODEL_TYPE],
       metrics_type=artifact_types[_TFX_METRICS_TYPE],
       trainer_type=execution_types[_TFX_TRAINER_TYPE]
   )
+  _PIPELINE_TYPES_CACHE[store] = pipeline_types
+  return pipeline_types
+
+
+def _find_types_by_name(types: Iterable[_MlmdType],
+                        names: AbstractSet[str]) -> Dict[str, _MlmdType]:
+  """Finds the types with the given names, stopping once all are found.
+
+  Args:
+    types: The ArtifactTypes or ExecutionTypes of a store.
+    names: The names of the types to find.
+
+  Returns:
+    A dict of the found types by name.
+  """
+  found_types = {}
+  for mlmd_type in types:
+    if mlmd_type.name in names:
+      found_types[mlmd_type.name] = mlmd_type
+      if len(found_types) == len(names):
+        break
+  return found_types
 
 
 def _validate_model_id(
     store: mlmd.MetadataStore, model_type: metadata_store_pb2.ArtifactType,
-    model_id: int
+    model_id: int, model: Optional[metadata_store_pb2.Artifact] = None
 ) -> metadata_store_pb2.Artifact:
   """Validates the given `model_id` against the `store`.
 
@@ -108,6 +160,8 @@ def _validate_model_id(
     store: A ml-metadata MetadataStore to be validated.
     model_type: The Model ArtifactType in the `store`.
     model_id: The id for the model artifact in the `store`.
+    model: An optional artifact with the `model_id`, already read from the
+      `store`. If given, it is validated without reading it again.
 
   Returns:
     The model artifact with the id.
@@ -116,10 +170,11 @@ def _validate_model_id(
     ValueError: If the `model_id` cannot be resolved as a Model artifact in the
       given `store`.
   """
-  model_artifacts = store.get_artifacts_by_id([model_id])
-  if not model_artifacts:
-    raise ValueError(f'Input model_id cannot be found: {model_id}.')
-  model = model_artifacts[0]
+  if model is None or model.id != model_id:
+    model_artifacts = store.get_artifacts_by_id([model_id])
+    if not model_artifacts:
+      raise ValueError(f'Input model_id cannot be found: {model_id}.')
+    model = model_artifacts[0]
   if model.type_id != model_type.id:
     raise ValueError(
         f'Found artifact with `model_id` is not an instance of Model: {model}.'
@@ -134,6 +189,24 @@ class _Direction(enum.Enum):
   SUCCESSOR = 2
 
 
+_OUTPUT_EVENTS = frozenset(
+    (
+        metadata_store_pb2.Event.OUTPUT,
+        metadata_store_pb2.Event.DECLARED_OUTPUT
+    )
+)
+_INPUT_EVENTS = frozenset(
+    (metadata_store_pb2.Event.INPUT, metadata_store_pb2.Event.DECLARED_INPUT)
+)
+
+# For each direction, the types of the events to follow from artifacts to
+# executions, and from executions to artifacts.
+_TRAVERSE_EVENTS = {
+    _Direction.ANCESTOR: (_OUTPUT_EVENTS, _INPUT_EVENTS),
+    _Direction.SUCCESSOR: (_INPUT_EVENTS, _OUTPUT_EVENTS),
+}
+
+
 def _get_one_hop_artifacts(
     store: mlmd.MetadataStore, artifact_ids: Iterable[int],
     direction: _Direction,
@@ -151,33 +224,23 @@ def _get_one_hop_artifacts(
   Returns:
     A list of qualified artifacts within 1-hop neighborhood in the `store`.
   """
-  traverse_events = {}
-  if direction == _Direction.ANCESTOR:
-    traverse_events['execution'] = (
-        metadata_store_pb2.Event.OUTPUT,
-        metadata_store_pb2.Event.DECLARED_OUTPUT
-    )
-    traverse_events['artifact'] = (
-        metadata_store_pb2.Event.INPUT, metadata_store_pb2.Event.DECLARED_INPUT
-    )
-  elif direction == _Direction.SUCCESSOR:
-    traverse_events['execution'] = (
-        metadata_store_pb2.Event.INPUT, metadata_store_pb2.Event.DECLARED_INPUT
-    )
-    traverse_events['artifact'] = (
-        metadata_store_pb2.Event.OUTPUT,
-        metadata_store_pb2.Event.DECLARED_OUTPUT
-    )
-  executions_ids = set(
+  execution_events, artifact_events = _TRAVERSE_EVENTS[direction]
+  # Each lookup depends on the ids found by the one before it, so they are
+  # issued in turn, stopping as soon as there is nothing left to look up.
+  executions_ids = {
       event.execution_id
       for event in store.get_events_by_artifact_ids(artifact_ids)
-      if event.type in traverse_events['execution']
-  )
-  artifacts_ids = set(
+      if event.type in execution_events
+  }
+  if not executions_ids:
+    return []
+  artifacts_ids = {
       event.artifact_id
       for event in store.get_events_by_execution_ids(executions_ids)
-      if event.type in traverse_events['artifact']
-  )
+      if event.type in artifact_events
+  }
+  if not artifacts_ids:
+    return []
   return [
       artifact for artifact in store.get_artifacts_by_id(artifacts_ids)
       if not filter_type or artifact.type_id == filter_type.id
@@ -201,20 +264,12 @@ def _get_one_hop_executions(
   Returns:
     A list of qualified executions within 1-hop neighborhood in the `store`.
   """
-  if direction == _Direction.ANCESTOR:
-    traverse_event = (
-        metadata_store_pb2.Event.OUTPUT,
-        metadata_store_pb2.Event.DECLARED_OUTPUT
-    )
-  elif direction == _Direction.SUCCESSOR:
-    traverse_event = (
-        metadata_store_pb2.Event.INPUT, metadata_store_pb2.Event.DECLARED_INPUT
-    )
-  executions_ids = set(
+  execution_events, _ = _TRAVERSE_EVENTS[direction]
+  executions_ids = {
       event.execution_id
       for event in store.get_events_by_artifact_ids(artifact_ids)
-      if event.type in traverse_event
-  )
+      if event.type in execution_events
+  }
   return [
       execution for execution in store.get_executions_by_id(executions_ids)
       if not filter_type or execution.type_id == filter_type.id
@@ -223,7 +278,8 @@ def _get_one_hop_executions(
 
 def get_metrics_artifacts_for_model(
     store: mlmd.MetadataStore, model_id: int,
-    pipeline_types: Optional[PipelineTypes] = None
+    pipeline_types: Optional[PipelineTypes] = None,
+    model: Optional[metadata_store_pb2.Artifact] = None
 ) -> List[metadata_store_pb2.Artifact]:
   """Gets a list of evaluation artifacts from a model artifact.
 
@@ -234,6 +290,8 @@ def get_metrics_artifacts_for_model(
     store: A ml-metadata MetadataStore to look for evaluation metrics.
     model_id: The id for the model artifact in the `store`.
     pipeline_types: An optional set of types if the `store` uses custom types.
+    model: An optional artifact with the `model_id`, already read from the
+      `store`, which saves reading it again.
 
   Returns:
     A list of metrics artifacts produced by the Evaluator component runs
@@ -245,7 +303,7 @@ def get_metrics_artifacts_for_model(
   """
   if not pipeline_types:
     pipeline_types = _get_tfx_pipeline_types(store)
-  _validate_model_id(store, pipeline_types.model_type, model_id)
+  _validate_model_id(store, pipeline_types.model_type, model_id, model)
   return _get_one_hop_artifacts(
       store, [model_id], _Direction.SUCCESSOR, pipeline_types.metrics_type
   )
@@ -253,7 +311,8 @@ def get_metrics_artifacts_for_model(
 
 def get_stats_artifacts_for_model(
     store: mlmd.MetadataStore, model_id: int,
-    pipeline_types: Optional[PipelineTypes] = None
+    pipeline_types: Optional[PipelineTypes] = None,
+    model: Optional[metadata_store_pb2.Artifact] = None
 ) -> List[metadata_store_pb2.Artifact]:
   """Gets a list of statistics artifacts from a model artifact.
 
@@ -265,6 +324,8 @@ def get_stats_artifacts_for_model(
     store: A ml-metadata MetadataStore instance.
     model_id: The id for the model artifact in the `store`.
     pipeline_types: An optional set of types if the `store` uses custom types.
+    model: An optional artifact with the `model_id`, already read from the
+      `store`, which saves reading it again.
 
   Returns:
     A list of statistics artifacts produced by the StatsGen component runs
@@ -276,7 +337,7 @@ def get_stats_artifacts_for_model(
   """
   if not pipeline_types:
     pipeline_types = _get_tfx_pipeline_types(store)
-  _validate_model_id(store, pipeline_types.model_type, model_id)
+  _validate_model_id(store, pipeline_types.model_type, model_id, model)
   trainer_examples = _get_one_hop_artifacts(
       store, [model_id], _Direction.ANCESTOR, pipeline_types.dataset_type
   )
@@ -284,16 +345,18 @@ def get_stats_artifacts_for_model(
   dataset_ids = set()
   transformed_example_ids = set()
   for example in trainer_examples:
-    if example.uri.find('/Transform/') != -1:
+    if '/Transform/' in example.uri:
       transformed_example_ids.add(example.id)
     else:
       dataset_ids.add(example.id)
-  dataset_ids.update(
-      dataset.id for dataset in _get_one_hop_artifacts(
-          store, transformed_example_ids, _Direction.ANCESTOR,
-          pipeline_types.dataset_type
-      )
-  )
+  if transformed_example_ids:
+    dataset_ids |= {
+        dataset.id
+        for dataset in _get_one_hop_artifacts(
+            store, transformed_example_ids, _Direction.ANCESTOR,
+            pipeline_types.dataset_type
+        )
+    }
   return _get_one_hop_artifacts(
       store, dataset_ids, _Direction.SUCCESSOR, pipeline_types.stats_type
   )
@@ -316,18 +379,22 @@ def _property_value(
     The value of the property if found in the node; If not, returns None.
   """
   properties = node.custom_properties if is_custom_property else node.properties
-  if name not in properties:
+  # `get` rather than indexing, which would add a missing property to the node.
+  value = properties.get(name)
+  if value is None:
     return None
-  if properties[name].WhichOneof('value') == 'int_value':
-    return properties[name].int_value
-  if properties[name].WhichOneof('value') == 'float_value':
-    return properties[name].double_value
-  return properties[name].string_value
+  value_type = value.WhichOneof('value')
+  if value_type == 'int_value':
+    return value.int_value
+  if value_type == 'double_value':
+    return value.double_value
+  return value.string_value
 
 
 def generate_model_card_for_model(
     store: mlmd.MetadataStore, model_id: int,
-    pipeline_types: Optional[PipelineTypes] = None
+    pipeline_types: Optional[PipelineTypes] = None,
+    model: Optional[metadata_store_pb2.Artifact] = None
 ) -> model_card_module.ModelCard:
   """Populates model card properties for a model artifact.
 
@@ -339,6 +406,8 @@ def generate_model_card_for_model(
     store: A ml-metadata MetadataStore instance.
     model_id: The id for the model artifact in the `store`.
     pipeline_types: An optional set of types if the `store` uses custom types.
+    model: An optional artifact with the `model_id`, already read from the
+      `store`, which saves reading it again.
 
   Returns:
     A ModelCard data object with the properties.
@@ -349,20 +418,22 @@ def generate_model_card_for_model(
   """
   if not pipeline_types:
     pipeline_types = _get_tfx_pipeline_types(store)
-  _validate_model_id(store, pipeline_types.model_type, model_id)
+  _validate_model_id(store, pipeline_types.model_type, model_id, model)
   model_card = model_card_module.ModelCard()
-  model_details = model_card.model_details
   trainers = _get_one_hop_executions(
       store, [model_id], _Direction.ANCESTOR, pipeline_types.trainer_type
   )
-  if trainers:
-    model_details.name = _property_value(trainers[-1], 'module_file')
-    model_details.version.name = _property_value(trainers[0], 'checksum_md5')
-    model_details.references = [
-        model_card_module.Reference(
-            reference=_property_value(trainers[0], 'pipeline_name')
-        )
-    ]
+  if not trainers:
+    return model_card
+  first_trainer, last_trainer = trainers[0], trainers[-1]
+  model_details = model_card.model_details
+  model_details.name = _property_value(last_trainer, 'module_file')
+  model_details.version.name = _property_value(first_trainer, 'checksum_md5')
+  model_details.references = [
+      model_card_module.Reference(
+          reference=_property_value(first_trainer, 'pipeline_name')
+      )
+  ]
   return model_card
 
 
@@ -371,6 +442,9 @@ def read_stats_protos(
 ) -> List[statistics_pb2.DatasetFeatureStatisticsList]:
   """Reads DatasetFeatureStatisticsList protos from provided uri.
 
+  The splits are read concurrently, as reading each of them takes several
+  round trips to a possibly remote file system.
+
   Args:
     stats_artifact_uri: the output artifact path of a StatsGen component.
 
@@ -378,13 +452,25 @@ def read_stats_protos(
     For each DatasetFeatureStatisticsList found in the directory, return in a
     list.
   """
+  def _read_split(
+      filename: str
+  ) -> Optional[statistics_pb2.DatasetFeatureStatisticsList]:
+    if not tf.io.gfile.isdir(os.path.join(stats_artifact_uri, filename)):
+      return None
+    return read_stats_proto(stats_artifact_uri, filename)
+
+  filenames = tf.io.gfile.listdir(stats_artifact_uri)
+  if not filenames:
+    return []
+  with concurrent.futures.ThreadPoolExecutor(
+      min(len(filenames), _MAX_READ_WORKERS)
+  ) as executor:
+    split_stats_protos = list(executor.map(_read_split, filenames))
   stats_protos = []
-  for filename in tf.io.gfile.listdir(stats_artifact_uri):
-    if tf.io.gfile.isdir(os.path.join(stats_artifact_uri, filename)):
-      stats_proto = read_stats_proto(stats_artifact_uri, filename)
-      if stats_proto:
-        logging.info('Reading stats artifact from %s', filename)
-        stats_protos.append(stats_proto)
+  for filename, stats_proto in zip(filenames, split_stats_protos):
+    if stats_proto:
+      logging.info('Reading stats artifact from %s', filename)
+      stats_protos.append(stats_proto)
   return stats_protos
 
 
@@ -409,22 +495,26 @@ def read_stats_proto(
       stats_artifact_uri, split, 'stats_tfrecord'
   )
 
-  if tf.io.gfile.exists(feature_stats_path):
+  # The files are read without checking that they exist first, which would
+  # take another round trip to the file system for each of them.
+  try:
     with tf.io.gfile.GFile(feature_stats_path, mode='rb') as f:
       stats.ParseFromString(f.read())
     return stats
-  elif tf.io.gfile.exists(stats_tfrecord_path):
+  except tf.errors.NotFoundError:
+    pass
+  try:
     serialized_stats = next(
         tf.compat.v1.io.tf_record_iterator(stats_tfrecord_path)
     )
-    stats.ParseFromString(serialized_stats)
-    return stats
-  else:
+  except tf.errors.NotFoundError:
     logging.warning(
         'No artifact found at %s or %s', stats_tfrecord_path,
         feature_stats_path
     )
     return None
+  stats.ParseFromString(serialized_stats)
+  return stats
 
 
 def read_metrics_eval_result(
@@ -449,6 +539,15 @@ def read_metrics_eval_result(
   return result
 
 
+def _parse_array_value(array: Dict[str, Any]) -> str:
+  """Joins the values of a TFMA arrayValue, or returns '' for unknown types."""
+  type_field = _TYPE_FIELD_MAP.get(array['dataType'])
+  if type_field is None:
+    logging.warning('Received unexpected array %s', str(array))
+    return ''
+  return ', '.join(map(str, array[type_field]))
+
+
 def annotate_eval_result_metrics(
     model_card: model_card_module.ModelCard, eval_result: tfma.EvalResult
 ):
@@ -461,27 +560,22 @@ def annotate_eval_result_metrics(
   Raises:
     ValueError: if eval_result is improperly formatted.
   """
-  def _parse_array_value(array: Dict[str, Any]) -> str:
-    data_type = array['dataType']
-    if data_type in _TYPE_FIELD_MAP:
-      type_field = _TYPE_FIELD_MAP[data_type]
-      return ', '.join([str(value) for value in array[type_field]])
-    else:
-      logging.warning('Received unexpected array %s', str(array))
-      return ''
+  # The metrics of each output are grouped by slice in a single pass over the
+  # slicing metrics, rather than with a pass per output name using
+  # `eval_result.get_metrics_for_all_slices`.
+  metrics_by_output = {}
+  for slice_repr, metrics_by_output_for_slice in eval_result.slicing_metrics:
+    for output_name, metrics_by_sub_key in metrics_by_output_for_slice.items():
+      metrics_by_slice = metrics_by_output.setdefault(output_name, {})
+      metrics_by_slice[slice_repr] = metrics_by_sub_key['']
 
   # NOTE: When multiple outputs are passed, each will be in it's own
   # output_name key. If that's the case add each output_name + metric
   # to the quantitative_analysis by namespacing by output_name.metric
   # to distinguish them
-  output_names = set()
-  for slicing_metric in eval_result.slicing_metrics:
-    for output_name in slicing_metric[1]:
-      output_names.add(output_name)
-  for output_name in sorted(output_names):
-    for slice_repr, metrics_for_slice in (
-        eval_result.get_metrics_for_all_slices(output_name=output_name).items()
-    ):
+  performance_metrics = []
+  for output_name, metrics_by_slice in sorted(metrics_by_output.items()):
+    for slice_repr, metrics_for_slice in metrics_by_slice.items():
       # Parse the slice name
       if not isinstance(slice_repr, tuple):
         raise ValueError(
@@ -506,11 +600,15 @@ def annotate_eval_result_metrics(
           metric_type = metric_name
           if output_name:
             metric_type = f'{output_name}.{metric_name}'
-          # Create the PerformanceMetric and append to the ModelCard
-          metric = model_card_module.PerformanceMetric(
-              type=metric_type, value=str(parsed_value), slice=slice_name
+          # Create the PerformanceMetric, to be added to the ModelCard
+          performance_metrics.append(
+              model_card_module.PerformanceMetric(
+                  type=metric_type, value=str(parsed_value), slice=slice_name
+              )
           )
-          model_card.quantitative_analysis.performance_metrics.append(metric)
+  model_card.quantitative_analysis.performance_metrics.extend(
+      performance_metrics
+  )
 
 
 def filter_metrics(
@@ -533,8 +631,10 @@ def filter_metrics(
     ValueError: if both metrics_include and metrics_exclude are provided.
   """
   if metrics_include and not metrics_exclude:
+    metrics_include = frozenset(metrics_include)
     include = lambda metric_name: metric_name in metrics_include
   elif metrics_exclude and not metrics_include:
+    metrics_exclude = frozenset(metrics_exclude)
     include = lambda metric_name: metric_name not in metrics_exclude
   else:
     raise ValueError(
@@ -545,15 +645,15 @@ def filter_metrics(
   filtered_slicing_metrics = []
   for slc, mtrc in eval_result.slicing_metrics:
     filtered_mtrc = {}
-    for output_name in mtrc:
-      for subkey in mtrc[output_name]:
-        for mtrc_name in mtrc[output_name][subkey]:
-          if include(mtrc_name):
-            filtered_mtrc[output_name] = filtered_mtrc.get(output_name, {})
-            filtered_mtrc[output_name][subkey] = filtered_mtrc[
-                output_name].get(subkey, {})
-            filtered_mtrc[output_name][subkey][mtrc_name] = mtrc[output_name][
-                subkey][mtrc_name]
+    for output_name, mtrc_by_subkey in mtrc.items():
+      for subkey, mtrc_by_name in mtrc_by_subkey.items():
+        filtered_mtrc_by_name = {
+            mtrc_name: value
+            for mtrc_name, value in mtrc_by_name.items() if include(mtrc_name)
+        }
+        if filtered_mtrc_by_name:
+          filtered_mtrc_by_subkey = filtered_mtrc.setdefault(output_name, {})
+          filtered_mtrc_by_subkey[subkey] = filtered_mtrc_by_name
     filtered_slicing_metrics.append(
         tfma.view.SlicedMetrics(slice=slc, metrics=filtered_mtrc)
     )
@@ -592,8 +692,10 @@ def filter_features(
   # Check that inputs are valid, and create filter function
   feature_name = lambda feature: feature.name or feature.path.step[0]
   if features_include and not features_exclude:
+    features_include = frozenset(features_include)
     include = lambda feature: feature_name(feature) in features_include
   elif features_exclude and not features_include:
+    features_exclude = frozenset(features_exclude)
     include = lambda feature: feature_name(feature) not in features_exclude
   else:
     raise ValueError(
@@ -601,16 +703,23 @@ def filter_features(
         'features_include and features_exclude.'
     )
 
-  # Create new DatasetFeatureStatistics
+  # Create new DatasetFeatureStatistics, copying every field but the features
+  # rather than copying all the features only to replace them.
   filtered_data_stats = statistics_pb2.DatasetFeatureStatistics()
-  filtered_data_stats.CopyFrom(dataset_stats)
+  for field, value in dataset_stats.ListFields():
+    if field.name == 'features':
+      continue
+    if field.label == field.LABEL_REPEATED:
+      getattr(filtered_data_stats, field.name).extend(value)
+    elif field.message_type:
+      getattr(filtered_data_stats, field.name).CopyFrom(value)
+    else:
+      setattr(filtered_data_stats, field.name, value)
 
   # Filter out features, and write to DatasetFeatureStatistics
-  filtered_features = [
+  filtered_data_stats.features.extend(
       feature for feature in dataset_stats.features if include(feature)
-  ]
-  del filtered_data_stats.features[:]
-  filtered_data_stats.features.extend(filtered_features)
+  )
 
   # Return filtered DatasetFeatureStatistics
   return filtered_data_stats
@@ -15,6 +15,7 @@
 
 import os
 import uuid
+from unittest import mock
 
 import ml_metadata as mlmd
 import tensorflow_model_analysis as tfma
@@ -149,7 +150,130 @@ _SLICING_METRICS = [
     )
 ]
 
-_DATASET_FEATURES = [
+# An artifact id which is not in the test pipeline store, as ids start from 1.
+_MISSING_MODEL_ID = 0
+
+_EVAL_RESULT = tfma.EvalResult(  # pytype: disable=wrong-arg-types
+    slicing_metrics=_SLICING_METRICS,
+    plots=None,
+    attributions=None,
+    config=None,
+    data_location=None,
+    file_format=None,
+    model_location=None)
+
+_EXPECTED_PERFORMANCE_METRICS = [
+    PerformanceMetric(
+        type='average_loss', value='0.07875693589448929', slice='weekday_0'
+    ),
+    PerformanceMetric(
+        type='prediction/mean', value='0.5100112557411194', slice='weekday_0'
+    ),
+    PerformanceMetric(
+        type='average_loss', value='4.4887189865112305', slice='weekday_1'
+    ),
+    PerformanceMetric(
+        type='prediction/mean', value='0.4839990735054016', slice='weekday_1'
+    ),
+    PerformanceMetric(
+        type='average_loss', value='2.092138290405273', slice='weekday_2'
+    ),
+    PerformanceMetric(
+        type='prediction/mean', value='0.3767518997192383', slice='weekday_2'
+    ),
+    PerformanceMetric(
+        type='average_loss', value='2.092138290405273',
+        slice='gender_male_X_age_10'
+    ),
+    PerformanceMetric(
+        type='prediction/mean', value='0.3767518997192383',
+        slice='gender_male_X_age_10'
+    ),
+    PerformanceMetric(
+        type='average_loss', value='2.092138290405273',
+        slice='gender_female_X_age_20'
+    ),
+    PerformanceMetric(
+        type='prediction/mean', value='0.3767518997192383',
+        slice='gender_female_X_age_20'
+    ),
+    PerformanceMetric(
+        type='average_loss', value='1.092138290405273', slice=''
+    ),
+    PerformanceMetric(
+        type='prediction/mean', value='0.4767518997192383', slice=''
+    ),
+    PerformanceMetric(type='int_array', value='1, 2, 3', slice=''),
+    PerformanceMetric(type='float_array', value='1.1, 2.2, 3.3', slice='')
+]
+
+_EXPECTED_FILTERED_SLICING_METRICS = [
+    (
+        (('weekday', 0), ), {
+            '': {
+                '': {
+                    'average_loss': {
+                        'doubleValue': 0.07875693589448929
+                    }
+                }
+            }
+        }
+    ),
+    (
+        (('weekday', 1), ), {
+            '': {
+                '': {
+                    'average_loss': {
+                        'doubleValue': 4.4887189865112305
+                    }
+                }
+            }
+        }
+    ),
+    (
+        (('weekday', 2), ), {
+            '': {
+                '': {
+                    'average_loss': {
+                        'doubleValue': 2.092138290405273
+                    }
+                }
+            }
+        }
+    ),
+    (
+        (('gender', 'male'), ('age', 10)), {
+            '': {
+                '': {
+                    'average_loss': {
+                        'doubleValue': 2.092138290405273
+                    }
+                }
+            }
+        }
+    ),
+    (
+        (('gender', 'female'), ('age', 20)), {
+            '': {
+                '': {
+                    'average_loss': {
+                        'doubleValue': 2.092138290405273
+                    }
+                }
+            }
+        }
+    ), ((), {
+        '': {
+            '': {
+                'average_loss': {
+                    'doubleValue': 1.092138290405273
+                }
+            }
+        }
+    })
+]
+
+_DATASET_FEATURES = (
     'data_channel', 'date', 'slug', 'LDA_00', 'LDA_01', 'LDA_02', 'LDA_03',
     'LDA_04', 'abs_title_sentiment_polarity', 'abs_title_subjectivity',
     'average_token_length', 'avg_negative_polarity', 'avg_positive_polarity',
@@ -165,15 +289,28 @@ _DATASET_FEATURES = [
     'rate_positive_words', 'self_reference_avg_shares',
     'self_reference_max_shares', 'self_reference_min_shares', 'timedelta',
     'title_sentiment_polarity', 'title_subjectivity', 'weekday'
-]
+)
+_FEATURES_FIRST_HALF = _DATASET_FEATURES[:27]
+_FEATURES_SECOND_HALF = _DATASET_FEATURES[27:]
 
 
 class TfUtilsTest(absltest.TestCase):
-  def setUp(self):
-    super().setUp()
-    self.tmp_db_path = os.path.join(
+  @classmethod
+  def setUpClass(cls):
+    super().setUpClass()
+    # The tests only read from the pipeline store, so it is built once for all
+    # of them.
+    tmp_db_path = os.path.join(
         absltest.get_default_test_tmpdir(), f'test_mlmd_{uuid.uuid4()}.db'
     )
+    cls.store = tf_testdata_utils.get_tfx_pipeline_metadata_store(tmp_db_path)
+    [stats] = cls.store.get_artifacts_by_id(
+        [tf_testdata_utils.TFX_0_21_STATS_ARTIFACT_ID]
+    )
+    cls.stats_uri = stats.uri
+    cls.metrics_uri = cls.store.get_artifacts_by_id(
+        tf_testdata_utils.TFX_0_21_METRICS_ARTIFACT_IDS
+    )[-1].uri
 
   def _get_empty_metadata_store(self):
     """Returns an empty in memory mlmd store."""
@@ -181,8 +318,17 @@ class TfUtilsTest(absltest.TestCase):
     empty_db_config.fake_database.SetInParent()
     return mlmd.MetadataStore(empty_db_config)
 
+  def test_get_tfx_pipeline_types_is_cached(self):
+    store = self.store
+    pipeline_types = tf_utils._get_tfx_pipeline_types(store)
+    with mock.patch.object(store, 'get_artifact_types') as get_artifact_types:
+      self.assertIs(tf_utils._get_tfx_pipeline_types(store), pipeline_types)
+      get_artifact_types.assert_not_called()
+    del tf_utils._PIPELINE_TYPES_CACHE[store]
+    self.assertIsNot(tf_utils._get_tfx_pipeline_types(store), pipeline_types)
+
   def test_get_metrics_artifacts_for_model(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
+    store = self.store
     got_metrics = tf_utils.get_metrics_artifacts_for_model(
         store, tf_testdata_utils.TFX_0_21_MODEL_ARTIFACT_ID
     )
@@ -192,13 +338,12 @@ class TfUtilsTest(absltest.TestCase):
     )
 
   def test_get_metrics_artifacts_for_model_model_with_model_not_found(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
+    store = self.store
     with self.assertRaisesRegex(ValueError, 'model_id cannot be found'):
-      model = metadata_store_pb2.Artifact()
-      tf_utils.get_metrics_artifacts_for_model(store, model.id)
+      tf_utils.get_metrics_artifacts_for_model(store, _MISSING_MODEL_ID)
 
   def test_get_metrics_artifacts_for_model_with_invalid_model(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
+    store = self.store
     with self.assertRaisesRegex(ValueError, 'not an instance of Model'):
       tf_utils.get_metrics_artifacts_for_model(
           store, tf_testdata_utils.TFX_0_21_MODEL_DATASET_ID
@@ -211,8 +356,25 @@ class TfUtilsTest(absltest.TestCase):
           empty_db, tf_testdata_utils.TFX_0_21_MODEL_ARTIFACT_ID
       )
 
+  def test_get_metrics_artifacts_for_model_with_model(self):
+    store = self.store
+    [model] = store.get_artifacts_by_id(
+        [tf_testdata_utils.TFX_0_21_MODEL_ARTIFACT_ID]
+    )
+    with mock.patch.object(
+        store, 'get_artifacts_by_id', wraps=store.get_artifacts_by_id
+    ) as get_artifacts_by_id:
+      got_metrics = tf_utils.get_metrics_artifacts_for_model(
+          store, model.id, model=model
+      )
+    self.assertNotIn(mock.call([model.id]), get_artifacts_by_id.call_args_list)
+    self.assertCountEqual(
+        [a.id for a in got_metrics],
+        tf_testdata_utils.TFX_0_21_METRICS_ARTIFACT_IDS
+    )
+
   def test_get_stats_artifacts_for_model(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
+    store = self.store
     got_stats = tf_utils.get_stats_artifacts_for_model(
         store, tf_testdata_utils.TFX_0_21_MODEL_ARTIFACT_ID
     )
@@ -221,14 +383,62 @@ class TfUtilsTest(absltest.TestCase):
         got_stats_ids, [tf_testdata_utils.TFX_0_21_STATS_ARTIFACT_ID]
     )
 
+  def test_get_stats_artifacts_for_model_without_transform(self):
+    pipeline_types = tf_utils.PipelineTypes(
+        dataset_type=metadata_store_pb2.ArtifactType(id=1),
+        stats_type=metadata_store_pb2.ArtifactType(id=2),
+        model_type=metadata_store_pb2.ArtifactType(id=3),
+        metrics_type=metadata_store_pb2.ArtifactType(id=4),
+        trainer_type=metadata_store_pb2.ExecutionType(id=5)
+    )
+    model = metadata_store_pb2.Artifact(id=10, type_id=3)
+    store = mock.create_autospec(mlmd.MetadataStore, instance=True)
+    store.get_events_by_artifact_ids.side_effect = [
+        [  # The trainer which output the model.
+            metadata_store_pb2.Event(
+                artifact_id=10, execution_id=20,
+                type=metadata_store_pb2.Event.OUTPUT
+            )
+        ],
+        [  # The StatsGen run which read the examples.
+            metadata_store_pb2.Event(
+                artifact_id=30, execution_id=40,
+                type=metadata_store_pb2.Event.INPUT
+            )
+        ]
+    ]
+    store.get_events_by_execution_ids.side_effect = [
+        [
+            metadata_store_pb2.Event(
+                artifact_id=30, execution_id=20,
+                type=metadata_store_pb2.Event.INPUT
+            )
+        ],
+        [
+            metadata_store_pb2.Event(
+                artifact_id=50, execution_id=40,
+                type=metadata_store_pb2.Event.OUTPUT
+            )
+        ]
+    ]
+    store.get_artifacts_by_id.side_effect = [
+        [metadata_store_pb2.Artifact(id=30, type_id=1, uri='/ExampleGen/')],
+        [metadata_store_pb2.Artifact(id=50, type_id=2, uri='/StatsGen/')]
+    ]
+    got_stats = tf_utils.get_stats_artifacts_for_model(
+        store, model.id, pipeline_types, model
+    )
+    self.assertEqual([a.id for a in got_stats], [50])
+    # No lineage is looked up for transformed examples, as there are none.
+    self.assertEqual(store.get_events_by_artifact_ids.call_count, 2)
+
   def test_get_stats_artifacts_for_model_with_model_not_found(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
+    store = self.store
     with self.assertRaisesRegex(ValueError, 'model_id cannot be found'):
-      model = metadata_store_pb2.Artifact()
-      tf_utils.get_stats_artifacts_for_model(store, model.id)
+      tf_utils.get_stats_artifacts_for_model(store, _MISSING_MODEL_ID)
 
   def test_get_stats_artifacts_for_model_with_invalid_model(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
+    store = self.store
     with self.assertRaisesRegex(ValueError, 'not an instance of Model'):
       tf_utils.get_stats_artifacts_for_model(
           store, tf_testdata_utils.TFX_0_21_MODEL_DATASET_ID
@@ -241,8 +451,24 @@ class TfUtilsTest(absltest.TestCase):
           empty_db, tf_testdata_utils.TFX_0_21_MODEL_ARTIFACT_ID
       )
 
+  def test_property_value(self):
+    execution = metadata_store_pb2.Execution()
+    execution.properties['int'].int_value = 1
+    execution.properties['double'].double_value = 0.5
+    execution.properties['string'].string_value = 'value'
+    execution.custom_properties['custom'].double_value = 1.5
+    self.assertEqual(tf_utils._property_value(execution, 'int'), 1)
+    self.assertEqual(tf_utils._property_value(execution, 'double'), 0.5)
+    self.assertEqual(tf_utils._property_value(execution, 'string'), 'value')
+    self.assertEqual(
+        tf_utils._property_value(execution, 'custom', is_custom_property=True),
+        1.5
+    )
+    self.assertIsNone(tf_utils._property_value(execution, 'missing'))
+    self.assertNotIn('missing', execution.properties)
+
   def test_generate_model_card_for_model(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
+    store = self.store
     model_card = tf_utils.generate_model_card_for_model(
         store, tf_testdata_utils.TFX_0_21_MODEL_ARTIFACT_ID
     )
@@ -269,13 +495,12 @@ class TfUtilsTest(absltest.TestCase):
     self.assertNotEmpty(datasets)
 
   def test_generate_model_card_for_model_with_model_not_found(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
+    store = self.store
     with self.assertRaisesRegex(ValueError, 'model_id cannot be found'):
-      model = metadata_store_pb2.Artifact()
-      tf_utils.generate_model_card_for_model(store, model.id)
+      tf_utils.generate_model_card_for_model(store, _MISSING_MODEL_ID)
 
   def test_generate_model_card_for_model_with_invalid_model(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
+    store = self.store
     with self.assertRaisesRegex(ValueError, 'not an instance of Model'):
       tf_utils.generate_model_card_for_model(
           store, tf_testdata_utils.TFX_0_21_MODEL_DATASET_ID
@@ -289,32 +514,17 @@ class TfUtilsTest(absltest.TestCase):
       )
 
   def test_read_stats_protos(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
-    stats = store.get_artifacts_by_id(
-        [tf_testdata_utils.TFX_0_21_STATS_ARTIFACT_ID]
-    )
-    self.assertLen(stats, 1)
-    data_stats = tf_utils.read_stats_protos(stats[-1].uri)
+    data_stats = tf_utils.read_stats_protos(self.stats_uri)
     self.assertLen(data_stats, 2)  # Split-eval, Split-train
 
   def test_read_stats_proto(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
-    stats = store.get_artifacts_by_id(
-        [tf_testdata_utils.TFX_0_21_STATS_ARTIFACT_ID]
-    )
-    self.assertLen(stats, 1)
-    train_stats = tf_utils.read_stats_proto(stats[-1].uri, 'Split-train')
+    train_stats = tf_utils.read_stats_proto(self.stats_uri, 'Split-train')
     self.assertIsNotNone(train_stats)
-    eval_stats = tf_utils.read_stats_proto(stats[-1].uri, 'Split-eval')
+    eval_stats = tf_utils.read_stats_proto(self.stats_uri, 'Split-eval')
     self.assertIsNotNone(eval_stats)
 
   def test_read_stats_proto_with_invalid_split(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
-    stats = store.get_artifacts_by_id(
-        [tf_testdata_utils.TFX_0_21_STATS_ARTIFACT_ID]
-    )
-    self.assertLen(stats, 1)
-    actual_stats = tf_utils.read_stats_proto(stats[-1].uri, 'invalid_split')
+    actual_stats = tf_utils.read_stats_proto(self.stats_uri, 'invalid_split')
     self.assertIsNone(actual_stats)
 
   def test_read_stats_proto_with_invalid_uri(self):
@@ -322,38 +532,31 @@ class TfUtilsTest(absltest.TestCase):
     self.assertIsNone(tf_utils.read_stats_proto('/does/not/exist/', 'eval'))
 
   def test_filter_features(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
-    stats = store.get_artifacts_by_id(
-        [tf_testdata_utils.TFX_0_21_STATS_ARTIFACT_ID]
-    )
-    dataset_stats = tf_utils.read_stats_protos(stats[-1].uri)[0].datasets[0]
-
-    one_half_of_the_features = _DATASET_FEATURES[:27]
-    the_other_half_of_the_features = _DATASET_FEATURES[27:]
+    dataset_stats = tf_utils.read_stats_protos(self.stats_uri)[0].datasets[0]
 
     with self.subTest(name='features_include'):
-      filtered_features = [
-          feature.path.step[0] for feature in tf_utils.filter_features(
-              dataset_stats, features_include=one_half_of_the_features
-          ).features
-      ]
-      self.assertSameElements(one_half_of_the_features, filtered_features)
+      filtered_stats = tf_utils.filter_features(
+          dataset_stats, features_include=_FEATURES_FIRST_HALF
+      )
+      self.assertCountEqual(
+          _FEATURES_FIRST_HALF,
+          (feature.path.step[0] for feature in filtered_stats.features)
+      )
     with self.subTest(name='features_exclude'):
-      filtered_features = [
-          feature.path.step[0] for feature in tf_utils.filter_features(
-              dataset_stats, features_exclude=one_half_of_the_features
-          ).features
-      ]
-      self.assertSameElements(
-          the_other_half_of_the_features, filtered_features
+      filtered_stats = tf_utils.filter_features(
+          dataset_stats, features_exclude=_FEATURES_FIRST_HALF
+      )
+      self.assertCountEqual(
+          _FEATURES_SECOND_HALF,
+          (feature.path.step[0] for feature in filtered_stats.features)
       )
     with self.subTest(
         name='both features_include and features_exclude (invalid)'
     ):
       with self.assertRaises(ValueError):
         tf_utils.filter_features(
-            dataset_stats, features_include=one_half_of_the_features,
-            features_exclude=the_other_half_of_the_features
+            dataset_stats, features_include=_FEATURES_FIRST_HALF,
+            features_exclude=_FEATURES_SECOND_HALF
         )
     with self.subTest(
         name='neither features_include nor features_exclude (invalid)'
@@ -362,190 +565,51 @@ class TfUtilsTest(absltest.TestCase):
         tf_utils.filter_features(dataset_stats)
 
   def test_read_metrics_eval_result(self):
-    store = tf_testdata_utils.get_tfx_pipeline_metadata_store(self.tmp_db_path)
-    metrics = store.get_artifacts_by_id(
-        tf_testdata_utils.TFX_0_21_METRICS_ARTIFACT_IDS
-    )
-    eval_result = tf_utils.read_metrics_eval_result(metrics[-1].uri)
+    eval_result = tf_utils.read_metrics_eval_result(self.metrics_uri)
     self.assertIsNotNone(eval_result)
 
   def test_read_metrics_eval_result_with_invalid_uri(self):
     self.assertIsNone(tf_utils.read_metrics_eval_result('/does/not/exist/'))
 
   def test_annotate_eval_results_metrics(self):
-    eval_result = tfma.EvalResult(  # pytype: disable=wrong-arg-types
-        slicing_metrics=_SLICING_METRICS,
-        plots=None,
-        attributions=None,
-        config=None,
-        data_location=None,
-        file_format=None,
-        model_location=None)
     model_card = ModelCard()
-    tf_utils.annotate_eval_result_metrics(model_card, eval_result)
-
-    expected_metrics = [
-        PerformanceMetric(
-            type='average_loss', value='0.07875693589448929', slice='weekday_0'
-        ),
-        PerformanceMetric(
-            type='prediction/mean', value='0.5100112557411194',
-            slice='weekday_0'
-        ),
-        PerformanceMetric(
-            type='average_loss', value='4.4887189865112305', slice='weekday_1'
-        ),
-        PerformanceMetric(
-            type='prediction/mean', value='0.4839990735054016',
-            slice='weekday_1'
-        ),
-        PerformanceMetric(
-            type='average_loss', value='2.092138290405273', slice='weekday_2'
-        ),
-        PerformanceMetric(
-            type='prediction/mean', value='0.3767518997192383',
-            slice='weekday_2'
-        ),
-        PerformanceMetric(
-            type='average_loss', value='2.092138290405273',
-            slice='gender_male_X_age_10'
-        ),
-        PerformanceMetric(
-            type='prediction/mean', value='0.3767518997192383',
-            slice='gender_male_X_age_10'
-        ),
-        PerformanceMetric(
-            type='average_loss', value='2.092138290405273',
-            slice='gender_female_X_age_20'
-        ),
-        PerformanceMetric(
-            type='prediction/mean', value='0.3767518997192383',
-            slice='gender_female_X_age_20'
-        ),
-        PerformanceMetric(
-            type='average_loss', value='1.092138290405273', slice=''
-        ),
-        PerformanceMetric(
-            type='prediction/mean', value='0.4767518997192383', slice=''
-        ),
-        PerformanceMetric(type='int_array', value='1, 2, 3', slice=''),
-        PerformanceMetric(type='float_array', value='1.1, 2.2, 3.3', slice='')
-    ]
+    tf_utils.annotate_eval_result_metrics(model_card, _EVAL_RESULT)
+
     self.assertEqual(
-        len(model_card.quantitative_analysis.performance_metrics),
-        len(expected_metrics)
+        model_card.quantitative_analysis.performance_metrics,
+        _EXPECTED_PERFORMANCE_METRICS
     )
-    for actual_metric, expected_metric in zip(
-        model_card.quantitative_analysis.performance_metrics, expected_metrics
-    ):
-      self.assertEqual(actual_metric.type, expected_metric.type)
-      self.assertEqual(actual_metric.slice, expected_metric.slice)
-      self.assertEqual(actual_metric.value, expected_metric.value)
 
   def test_filter_metrics(self):
-    eval_result = tfma.EvalResult(  # pytype: disable=wrong-arg-types
-        slicing_metrics=_SLICING_METRICS,
-        plots=None,
-        attributions=None,
-        config=None,
-        data_location=None,
-        file_format=None,
-        model_location=None)
     metrics_include = ['average_loss']
     metrics_exclude = [
         'prediction/mean', 'int_array', 'float_array', 'invalid_array'
     ]
-    expected_slicing_metrics = [
-        (
-            (('weekday', 0), ), {
-                '': {
-                    '': {
-                        'average_loss': {
-                            'doubleValue': 0.07875693589448929
-                        }
-                    }
-                }
-            }
-        ),
-        (
-            (('weekday', 1), ), {
-                '': {
-                    '': {
-                        'average_loss': {
-                            'doubleValue': 4.4887189865112305
-                        }
-                    }
-                }
-            }
-        ),
-        (
-            (('weekday', 2), ), {
-                '': {
-                    '': {
-                        'average_loss': {
-                            'doubleValue': 2.092138290405273
-                        }
-                    }
-                }
-            }
-        ),
-        (
-            (('gender', 'male'), ('age', 10)), {
-                '': {
-                    '': {
-                        'average_loss': {
-                            'doubleValue': 2.092138290405273
-                        }
-                    }
-                }
-            }
-        ),
-        (
-            (('gender', 'female'), ('age', 20)), {
-                '': {
-                    '': {
-                        'average_loss': {
-                            'doubleValue': 2.092138290405273
-                        }
-                    }
-                }
-            }
-        ),
-        ((), {
-            '': {
-                '': {
-                    'average_loss': {
-                        'doubleValue': 1.092138290405273
-                    }
-                }
-            }
-        })
-    ]
     with self.subTest(name='metrics_include'):
       self.assertEqual(
           tf_utils.filter_metrics(
-              eval_result, metrics_include=metrics_include
-          ).slicing_metrics, expected_slicing_metrics
+              _EVAL_RESULT, metrics_include=metrics_include
+          ).slicing_metrics, _EXPECTED_FILTERED_SLICING_METRICS
       )
     with self.subTest(name='metrics_exclude'):
       self.assertEqual(
           tf_utils.filter_metrics(
-              eval_result, metrics_exclude=metrics_exclude
-          ).slicing_metrics, expected_slicing_metrics
+              _EVAL_RESULT, metrics_exclude=metrics_exclude
+          ).slicing_metrics, _EXPECTED_FILTERED_SLICING_METRICS
       )
     with self.subTest(
         name='both metrics_include and metrics_exclude (invalid)'
     ):
       with self.assertRaises(ValueError):
         tf_utils.filter_metrics(
-            eval_result, metrics_include=metrics_include,
+            _EVAL_RESULT, metrics_include=metrics_include,
             metrics_exclude=metrics_exclude
         )
     with self.subTest(
         name='neither metrics_include nor metrics_exclude (invalid)'
     ):
       with self.assertRaises(ValueError):
-        tf_utils.filter_metrics(eval_result)
+        tf_utils.filter_metrics(_EVAL_RESULT)
 
 
 if __name__ == '__main__':
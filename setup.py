@@ -14,6 +14,10 @@
 # ==============================================================================
 """Setup to install the Model Card Toolkit."""
 
+import functools
+import importlib.util
+import os
+import pathlib
 import platform
 import shutil
 import subprocess
@@ -21,23 +25,30 @@ from distutils.command import build
 
 from setuptools import Command, setup
 
+
+def _load_module(name, path):
+  """Loads the module at path without importing its parent package."""
+  spec = importlib.util.spec_from_file_location(name, path)
+  module = importlib.util.module_from_spec(spec)
+  spec.loader.exec_module(module)
+  return module
+
+
 # Get dependency lists.
-with open('model_card_toolkit/dependencies.py') as fp:
-  globals_dict = {}
-  exec(fp.read(), globals_dict)  # pylint: disable=exec-used
-make_required_install_packages = globals_dict['make_required_install_packages']
-make_required_extra_packages = globals_dict['make_required_extra_packages']
-make_extra_packages_test = globals_dict['make_extra_packages_test']
+_dependencies = _load_module(
+    'model_card_toolkit_dependencies', 'model_card_toolkit/dependencies.py'
+)
+make_required_install_packages = _dependencies.make_required_install_packages
+make_required_extra_packages = _dependencies.make_required_extra_packages
+make_extra_packages_test = _dependencies.make_extra_packages_test
 
 # Get version from version module.
-with open('model_card_toolkit/version.py') as fp:
-  globals_dict = {}
-  exec(fp.read(), globals_dict)  # pylint: disable=exec-used
-__version__ = globals_dict['__version__']
+__version__ = _load_module(
+    'model_card_toolkit_version', 'model_card_toolkit/version.py'
+).__version__
 
 # Get long description.
-with open('README.md', 'r', encoding='utf-8') as fh:
-  _LONG_DESCRIPTION = fh.read()
+_LONG_DESCRIPTION = pathlib.Path('README.md').read_text(encoding='utf-8')
 
 
 class _BuildCommand(build.build):
@@ -62,16 +73,26 @@ class _BuildCommand(build.build):
   ] + build.build.sub_commands
 
 
+@functools.lru_cache(maxsize=1)
+def _find_bazel():
+  """Returns the path of the bazel binary, or None if it is not found.
+
+  The BAZEL_BIN environment variable takes precedence over searching the PATH.
+  """
+  # verified with bazel 2.0.0, 3.0.0, and 4.0.0 via bazelisk
+  return (
+      os.environ.get('BAZEL_BIN') or shutil.which('bazel')
+      or shutil.which('bazelisk')
+  )
+
+
 class _BazelBuildCommand(Command):
   """Build Bazel artifacts and move generated files."""
   def initialize_options(self):
     pass
 
   def finalize_options(self):
-    # verified with bazel 2.0.0, 3.0.0, and 4.0.0 via bazelisk
-    self._bazel_cmd = shutil.which('bazel')
-    if not self._bazel_cmd:
-      self._bazel_cmd = shutil.which('bazelisk')
+    self._bazel_cmd = _find_bazel()
     if not self._bazel_cmd:
       raise RuntimeError(
           'Could not find "bazel" or "bazelisk" binary. Please visit '
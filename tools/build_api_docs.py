@@ -7,25 +7,30 @@ from tensorflow_docs.api_generator import generate_lib, public_api
 
 import model_card_toolkit
 
-FLAGS = flags.FLAGS
+_BASE_DIR = os.path.dirname(model_card_toolkit.__file__)
 
-flags.DEFINE_string(
+_CALLBACKS = (
+    public_api.explicit_package_contents_filter,
+    public_api.local_definitions_filter
+)
+
+_OUTPUT_DIR = flags.DEFINE_string(
     "output_dir", default="/tmp/model_card_toolkit",
     help="Where to output the docs"
 )
 
-flags.DEFINE_string(
+_CODE_URL_PREFIX = flags.DEFINE_string(
     "code_url_prefix", default=
     "https://github.com/tensorflow/model-card-toolkit/tree/main/model-card-toolkit",
     help="The URL prefix for links to code."
 )
 
-flags.DEFINE_bool(
+_SEARCH_HINTS = flags.DEFINE_bool(
     "search_hints", default=True,
     help="Include metadata search hints in the generated files"
 )
 
-flags.DEFINE_string(
+_SITE_PATH = flags.DEFINE_string(
     "site_path", default="responsible-ai/model_card_toolkit/api_docs/python",
     help="Path prefix in the _toc.yaml"
 )
@@ -41,12 +46,9 @@ def execute(
   doc_generator = generate_lib.DocGenerator(
       root_title="Model Card Toolkit", py_modules=[
           ("model_card_toolkit", model_card_toolkit)
-      ], base_dir=os.path.dirname(model_card_toolkit.__file__),
-      search_hints=search_hints, code_url_prefix=code_url_prefix,
-      site_path=site_path, callbacks=[
-          public_api.explicit_package_contents_filter,
-          public_api.local_definitions_filter
-      ]
+      ], base_dir=_BASE_DIR, search_hints=search_hints,
+      code_url_prefix=code_url_prefix, site_path=site_path,
+      callbacks=list(_CALLBACKS)
   )
 
   doc_generator.build(output_dir)
@@ -54,8 +56,8 @@ def execute(
 
 def main(unused_argv):
   execute(
-      FLAGS.output_dir, FLAGS.code_url_prefix, FLAGS.search_hints,
-      FLAGS.site_path
+      _OUTPUT_DIR.value, _CODE_URL_PREFIX.value, _SEARCH_HINTS.value,
+      _SITE_PATH.value
   )
 
 